@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Depth Colormap - shared raw depth -> JET colour lookup
+Used by the Kinect display scripts so each one colours depth with a single LUT gather
+"""
+
+import cv2
+import numpy as np
+
+# JET colour for each 8-bit level, shape (256, 3) BGR
+JET_BGR = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(256, 1), cv2.COLORMAP_JET).reshape(256, 3)
+
+# Every possible raw depth value, built once for LUT rebuilds
+DEPTH_VALUES = np.arange(65536, dtype=np.uint16)
+
+def build_depth_lut(min_depth, max_depth):
+    """Map every raw uint16 depth value straight to a JET BGR colour, shape (65536, 3)"""
+    bins = np.linspace(min_depth, max(max_depth, min_depth + 1), 256, dtype=np.float32)
+    levels = np.digitize(DEPTH_VALUES, bins)
+    levels -= 1
+    np.clip(levels, 0, 255, out=levels)
+    return JET_BGR[levels]
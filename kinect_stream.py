@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Kinect Stream - shared background Kinect reader
+Starts freenect once per process and keeps only the latest depth/RGB frame
+"""
+
+import threading
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+import freenect
+
+class KinectFrame(NamedTuple):
+    """Matched depth/RGB pair published as one immutable snapshot"""
+    depth: Optional[np.ndarray]
+    rgb: Optional[np.ndarray]
+    depth_timestamp: Optional[int]
+    rgb_timestamp: Optional[int]
+    depth_seq: int = 0  # Write number of the depth buffer, see KinectStream.depth_buffer_intact()
+
+class KinectStream:
+    """
+    Background Kinect reader that keeps only the latest depth/RGB frame.
+    Uses freenect.runloop callbacks when available, sync calls otherwise.
+    """
+    
+    def __init__(self):
+        self.depth = None
+        self.rgb = None
+        self.depth_timestamp = None
+        self.rgb_timestamp = None
+        self.depthcond = threading.Condition()
+        self.rgbcond = threading.Condition()
+        self.frame = None  # Latest KinectFrame, swapped by reference
+        self.frame_event = threading.Event()  # Set whenever any new frame arrives
+        self.depth_listeners = []  # fn(depth, timestamp), called on the capture thread
+        self.rgb_listeners = []  # fn(rgb, timestamp), called on the capture thread
+        self.running = False
+        self.thread = None
+        self._depth_bufs = []  # Recycled depth buffers, see use_depth_buffers()
+        self._depth_buf_index = 0
+        self._depth_writes = 0  # Depth buffer writes started, bumped before a ring slot is overwritten
+        self.depth_seq = 0  # Write number of the published depth buffer
+        
+    def _depth_cb(self, dev, data, timestamp):
+        self._depth_writes += 1
+        seq = self._depth_writes
+        if self._depth_bufs:
+            # Copy into the next preallocated buffer instead of a fresh array
+            self._depth_buf_index = (self._depth_buf_index + 1) % len(self._depth_bufs)
+            depth = self._depth_bufs[self._depth_buf_index]
+            if depth.shape != data.shape or depth.dtype != data.dtype:
+                depth = self._depth_bufs[self._depth_buf_index] = np.empty_like(data)
+            np.copyto(depth, data)
+        else:
+            depth = data.copy()
+        with self.depthcond:
+            self.depth = depth
+            self.depth_timestamp = timestamp
+            self.depth_seq = seq
+            self._publish()
+            self.depthcond.notify_all()
+        self.frame_event.set()
+        for listener in self.depth_listeners:
+            listener(depth, timestamp)
+    
+    def _rgb_cb(self, dev, data, timestamp):
+        rgb = data.copy()
+        with self.rgbcond:
+            self.rgb = rgb
+            self.rgb_timestamp = timestamp
+            self._publish()
+            self.rgbcond.notify_all()
+        self.frame_event.set()
+        for listener in self.rgb_listeners:
+            listener(rgb, timestamp)
+    
+    def _publish(self):
+        # Callbacks run on the single capture thread, so the pair is consistent;
+        # readers just pick up the reference without taking either condition
+        self.frame = KinectFrame(self.depth, self.rgb, self.depth_timestamp, self.rgb_timestamp,
+                                 self.depth_seq)
+    
+    def _body(self, *args):
+        if not self.running:
+            raise freenect.Kill
+    
+    def _run(self):
+        if hasattr(freenect, 'runloop'):
+            freenect.runloop(depth=self._depth_cb, video=self._rgb_cb, body=self._body)
+            return
+        
+        # Fallback for freenect builds without the async API
+        while self.running:
+            depth_data, depth_timestamp = freenect.sync_get_depth()
+            if depth_data is not None:
+                self._depth_cb(None, depth_data, depth_timestamp)
+            rgb_data, rgb_timestamp = freenect.sync_get_video()
+            if rgb_data is not None:
+                self._rgb_cb(None, rgb_data, rgb_timestamp)
+    
+    def use_depth_buffers(self, count):
+        """
+        Recycle count preallocated depth buffers instead of allocating a copy
+        per frame. Only for consumers that are done with a depth frame before
+        count - 1 newer frames arrive; count=0 restores per-frame copies.
+        """
+        self._depth_bufs = [np.empty((480, 640), dtype=np.uint16) for _ in range(count)]
+        self._depth_buf_index = 0
+    
+    def depth_buffer_intact(self, seq):
+        """
+        True while the depth buffer of the KinectFrame with depth_seq == seq has
+        not been overwritten by the buffer ring. Check after using the buffer.
+        """
+        return not self._depth_bufs or self._depth_writes - seq < len(self._depth_bufs)
+    
+    def start(self):
+        """Start the capture thread (no-op if already running)"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop the capture thread"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+    
+    def wait_for_frame(self, timeout=None):
+        """Block until a new depth or RGB frame arrives, returns False on timeout"""
+        arrived = self.frame_event.wait(timeout)
+        self.frame_event.clear()
+        return arrived
+    
+    def latest_frame(self):
+        """Return the most recent KinectFrame (or None) without blocking"""
+        return self.frame
+    
+    def latest_depth(self, timeout=None):
+        """Return the most recent depth frame, waiting up to timeout for the first one"""
+        with self.depthcond:
+            if self.depth is None and timeout:
+                self.depthcond.wait(timeout)
+            return self.depth
+    
+    def latest_rgb(self, timeout=None):
+        """Return the most recent RGB frame, waiting up to timeout for the first one"""
+        with self.rgbcond:
+            if self.rgb is None and timeout:
+                self.rgbcond.wait(timeout)
+            return self.rgb
+
+
+# Process-wide stream so every script shares one freenect startup
+_kinect_stream = None
+_kinect_stream_lock = threading.Lock()
+
+def ensure_kinect_started():
+    """Return the shared KinectStream, starting its capture thread if needed"""
+    global _kinect_stream
+    with _kinect_stream_lock:
+        if _kinect_stream is None:
+            _kinect_stream = KinectStream()
+        _kinect_stream.start()
+        return _kinect_stream
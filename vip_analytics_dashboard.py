@@ -6,26 +6,37 @@ Integrates with existing test suites and performance data
 """
 
 import json
-import os
 import glob
+import time
 import asyncio
 import websockets
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, NamedTuple
+from collections import deque
 import statistics
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass, asdict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
-class AnalyticsMetrics:
-    """Core analytics metrics"""
+class AnalyticsMetrics(NamedTuple):
+    """Core analytics metrics (immutable tuple, no per-instance __dict__)"""
     timestamp: str
     performance_score: float
     system_health: float
@@ -37,6 +48,10 @@ class AnalyticsMetrics:
 class VIPAnalyticsDashboard:
     def __init__(self):
         self.port = 8768
+        self.http_port = 8769  # Report downloads (aiohttp sidecar)
+        self.http_runner = None
+        self.reports_dir = Path.cwd()
+        self.report_prefix = 'comprehensive_analytics_report_'
         self.base_dir = Path(__file__).parent
         self.data_sources = {
             'demo_reports': 'professional_demo_report_*.json',
@@ -45,11 +60,15 @@ class VIPAnalyticsDashboard:
             'websocket_reports': 'websocket_integration_report.json'
         }
         self.analytics_cache = {}
-        self.real_time_metrics = []
+        self.cache_ttl_seconds = 5.0
+        self.max_real_time_metrics = 10000
+        self.real_time_metrics = deque(maxlen=self.max_real_time_metrics)
+        self.clients = set()
         
     async def handle_client(self, websocket):
         """Handle WebSocket client connections for real-time analytics"""
         logger.info(f"📊 Analytics Dashboard client connected: {websocket.remote_address}")
+        self.clients.add(websocket)
         
         try:
             # Send initial dashboard data
@@ -73,6 +92,8 @@ class VIPAnalyticsDashboard:
                     }))
         except websockets.exceptions.ConnectionClosed:
             logger.info("📊 Analytics Dashboard client disconnected")
+        finally:
+            self.clients.discard(websocket)
     
     async def process_analytics_request(self, data: Dict) -> Dict:
         """Process analytics requests"""
@@ -108,6 +129,12 @@ class VIPAnalyticsDashboard:
             'timestamp': datetime.now().isoformat()
         }
         await websocket.send(json.dumps(dashboard_data))
+
+    def broadcast(self, message: Dict):
+        """Serialize a message once and write it to every connected client"""
+        if not self.clients:
+            return
+        websockets.broadcast(self.clients, json.dumps(message))
     
     async def get_executive_summary(self) -> Dict:
         """Generate executive summary from all data sources"""
@@ -144,7 +171,8 @@ class VIPAnalyticsDashboard:
                 f"💰 ${roi_projection:,.0f} projected annual ROI",
                 f"🚀 {market_readiness:.1f}% market readiness score"
             ],
-            'recommendations': self.generate_executive_recommendations(demo_reports),
+            'recommendations': self.generate_executive_recommendations(
+                demo_reports, avg_perf_score=avg_performance_score),
             'timestamp': datetime.now().isoformat()
         }
     
@@ -318,8 +346,23 @@ class VIPAnalyticsDashboard:
             'timestamp': datetime.now().isoformat()
         }
     
+    def _get_cached(self, key: str, loader) -> List[Dict]:
+        """Return a recently loaded data source, reloading it once the TTL expires"""
+        now = time.monotonic()
+        cached = self.analytics_cache.get(key)
+        if cached is not None and now - cached[0] < self.cache_ttl_seconds:
+            return cached[1]
+
+        data = loader()
+        self.analytics_cache[key] = (now, data)
+        return data
+
     def load_demo_reports(self) -> List[Dict]:
         """Load all professional demo reports"""
+        return self._get_cached('demo_reports', self._load_demo_reports)
+
+    def _load_demo_reports(self) -> List[Dict]:
+        """Read demo reports from disk"""
         reports = []
         pattern = str(self.base_dir / self.data_sources['demo_reports'])
         
@@ -335,6 +378,10 @@ class VIPAnalyticsDashboard:
     
     def load_system_test_reports(self) -> List[Dict]:
         """Load all system test reports"""
+        return self._get_cached('system_tests', self._load_system_test_reports)
+
+    def _load_system_test_reports(self) -> List[Dict]:
+        """Read system test reports from disk"""
         reports = []
         pattern = str(self.base_dir / self.data_sources['system_tests'])
         
@@ -431,14 +478,16 @@ class VIPAnalyticsDashboard:
 
         return statistics.mean(readiness_scores) if readiness_scores else 75.0
 
-    def generate_executive_recommendations(self, demo_reports: List[Dict]) -> List[str]:
+    def generate_executive_recommendations(self, demo_reports: List[Dict],
+                                           avg_perf_score: Optional[float] = None) -> List[str]:
         """Generate executive recommendations based on data"""
         recommendations = []
 
         if len(demo_reports) >= 5:
             recommendations.append("✅ Strong demonstration track record - ready for investor presentations")
 
-        avg_perf = self.calculate_avg_performance_score(demo_reports)
+        # Reuse the caller's score when available instead of re-aggregating the reports
+        avg_perf = avg_perf_score if avg_perf_score is not None else self.calculate_avg_performance_score(demo_reports)
         if avg_perf > 80:
             recommendations.append("🚀 Excellent performance metrics - consider premium pricing strategy")
         elif avg_perf < 60:
@@ -694,13 +743,16 @@ class VIPAnalyticsDashboard:
         """Export comprehensive analytics report"""
         logger.info(f"📄 Exporting comprehensive report in {format_type} format...")
 
-        # Gather all analytics data
-        executive_summary = await self.get_executive_summary()
-        performance_trends = await self.get_performance_trends('30d')
-        roi_analysis = await self.get_roi_analysis()
-        system_health = await self.get_system_health()
-        user_analytics = await self.get_user_analytics()
-        technical_metrics = await self.get_technical_metrics()
+        # Gather all analytics data (the sections are independent and share the cached data load)
+        (executive_summary, performance_trends, roi_analysis,
+         system_health, user_analytics, technical_metrics) = await asyncio.gather(
+            self.get_executive_summary(),
+            self.get_performance_trends('30d'),
+            self.get_roi_analysis(),
+            self.get_system_health(),
+            self.get_user_analytics(),
+            self.get_technical_metrics()
+        )
 
         comprehensive_report = {
             'report_metadata': {
@@ -717,35 +769,94 @@ class VIPAnalyticsDashboard:
             'technical_metrics': technical_metrics
         }
 
-        # Save report to file
+        # Save report to file (serialization and disk write run off the event loop)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"comprehensive_analytics_report_{timestamp}.{format_type}"
+        filename = f"{self.report_prefix}{timestamp}.{format_type}"
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            if format_type == 'json':
-                json.dump(comprehensive_report, f, indent=2, ensure_ascii=False)
-            else:
-                # For other formats, convert to JSON for now
-                json.dump(comprehensive_report, f, indent=2, ensure_ascii=False)
+        # For non-JSON formats, convert to JSON for now
+        loop = asyncio.get_running_loop()
+        size_bytes = await loop.run_in_executor(
+            None, self.write_report, self.reports_dir / filename, comprehensive_report
+        )
 
-        return {
+        result = {
             'type': 'export_complete',
             'filename': filename,
-            'size_kb': os.path.getsize(filename) / 1024,
+            'size_kb': size_bytes / 1024,
             'format': format_type,
             'timestamp': datetime.now().isoformat()
         }
 
+        # Clients fetch the report over HTTP; only the URL travels over the WebSocket
+        if self.http_runner is not None:
+            result['url'] = f"http://localhost:{self.http_port}/reports/{filename}"
+            self.broadcast({
+                'type': 'export_ready',
+                'filename': filename,
+                'url': result['url'],
+                'timestamp': result['timestamp']
+            })
+
+        return result
+
+    async def handle_report_download(self, request):
+        """Serve an exported report file (sendfile-backed FileResponse)"""
+        filename = request.match_info['filename']
+
+        # Only serve generated reports from the reports directory
+        if Path(filename).name != filename or not filename.startswith(self.report_prefix):
+            raise web.HTTPNotFound()
+
+        path = self.reports_dir / filename
+        if not path.is_file():
+            raise web.HTTPNotFound()
+
+        return web.FileResponse(path)
+
+    async def start_http_server(self):
+        """Start the HTTP sidecar used for report downloads"""
+        if not AIOHTTP_AVAILABLE:
+            logger.warning("⚠️ aiohttp not available - report downloads disabled")
+            return
+
+        app = web.Application()
+        app.router.add_get('/reports/{filename}', self.handle_report_download)
+
+        self.http_runner = web.AppRunner(app)
+        await self.http_runner.setup()
+        await web.TCPSite(self.http_runner, "localhost", self.http_port).start()
+        logger.info(f"✅ Report downloads available on http://localhost:{self.http_port}/reports/")
+
+    def serialize_report(self, report: Dict) -> bytes:
+        """Serialize a report to indented UTF-8 JSON (orjson when available)"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                report,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+            )
+        return json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def write_report(self, path: Path, report: Dict) -> int:
+        """Write a serialized report in a single buffered write, returns its size in bytes"""
+        data = self.serialize_report(report)
+        path.write_bytes(data)
+        return len(data)
+
     async def start_server(self):
         """Start the VIP Analytics Dashboard WebSocket server"""
         logger.info(f"📊 Starting VIP Analytics Dashboard on port {self.port}")
 
         try:
+            await self.start_http_server()
             async with websockets.serve(self.handle_client, "localhost", self.port):
                 logger.info(f"✅ VIP Analytics Dashboard running on ws://localhost:{self.port}")
                 await asyncio.Future()  # Run forever
         except Exception as e:
             logger.error(f"❌ Failed to start Analytics Dashboard: {e}")
+        finally:
+            if self.http_runner is not None:
+                await self.http_runner.cleanup()
+                self.http_runner = None
 
 async def main():
     """Main entry point"""
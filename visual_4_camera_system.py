@@ -9,8 +9,9 @@ import numpy as np
 import time
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from scipy.interpolate import griddata
+from scipy.ndimage import map_coordinates
 
 # Import existing resources
 sys.path.append('external_libs/python-examples-cv')
@@ -31,6 +32,65 @@ except ImportError:
     KINECT_AVAILABLE = False
     print("❌ Kinect library not available")
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    print("✅ Numba JIT available")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("⚠️ Numba not available - using NumPy point cloud path")
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _depth_to_points(depth, ray_x, ray_y, out_xyz):
+        """Deproject valid depth pixels into out_xyz, returns number of points written"""
+        h, w = depth.shape
+
+        # Pass 1: count valid pixels per row
+        row_counts = np.zeros(h, dtype=np.int64)
+        for i in prange(h):
+            count = 0
+            for j in range(w):
+                if depth[i, j] > 0:
+                    count += 1
+            row_counts[i] = count
+
+        offsets = np.zeros(h + 1, dtype=np.int64)
+        for i in range(h):
+            offsets[i + 1] = offsets[i] + row_counts[i]
+
+        # Pass 2: each row writes its points into its own output range
+        for i in prange(h):
+            k = offsets[i]
+            for j in range(w):
+                z = depth[i, j]
+                if z > 0:
+                    out_xyz[k, 0] = ray_x[i, j] * z
+                    out_xyz[k, 1] = ray_y[i, j] * z
+                    out_xyz[k, 2] = z
+                    k += 1
+
+        return offsets[h]
+
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _fuse_depth(kinect_mm, stereo_m, out):
+        """Fuse Kinect (raw mm) and stereo (m) depth in a single pass over both inputs"""
+        h, w = out.shape
+        mm_to_m = np.float32(0.001)
+        w_kinect, w_stereo = np.float32(0.7), np.float32(0.3)
+        for i in prange(h):
+            for j in range(w):
+                k = np.float32(kinect_mm[i, j]) * mm_to_m
+                s = stereo_m[i, j]
+                if k > 0 and s > 0:
+                    out[i, j] = w_kinect * k + w_stereo * s
+                elif k > 0:
+                    out[i, j] = k
+                elif s > 0:
+                    out[i, j] = s
+                else:
+                    out[i, j] = 0.0
+
 class Visual4CameraSystem:
     """
     Complete 4-camera system with visual display to keep Kinect active
@@ -61,7 +121,40 @@ class Visual4CameraSystem:
         self.topography_grid = None
         self.stereo_depth = None
         self.fused_depth = None
+        self._blend_buf = None
+        self._kinect_raw_buf = None
+        self._kinect_resized_buf = None
         self.grid_resolution = 0.005  # 5mm precision
+        self.topography_interval = 0.2  # Rebuild topography at most at 5 Hz
+        self._topo_last_ts = 0.0
+
+        # Camera intrinsics (Kinect approximate); float32 so depth math never upcasts
+        self.fx, self.fy = np.float32(525.0), np.float32(525.0)
+        self._xy_cache = {}  # (h, w) -> ((u-cx)/fx, (v-cy)/fy)
+        self._points_buf = None
+
+        self._gray_bufs = [None, None]  # per-webcam grayscale buffers for stereo
+        self.stereo_pyramid_levels = 1  # block-match at half resolution
+        self._disp_buf = None  # int16 StereoBM output, reused
+        self._depth_buf = None  # float32 stereo depth scratch, reused
+
+        # Stereo matcher (GPU when available, created once and reused)
+        self.use_cuda_stereo, self.stereo_matcher = self._create_stereo_matcher()
+        
+        # Display path uses the OpenCL T-API (transparent CPU fallback)
+        cv2.ocl.setUseOpenCL(True)
+
+        # Webcam reads are issued concurrently so capture waits max(t1, t2)
+        self._webcam_pool = ThreadPoolExecutor(max_workers=2)
+
+        # Capture / extrapolation pipeline (see start_pipeline)
+        self._kinect_thread = None
+        self._kinect_lock = threading.Lock()
+        self._kinect_latest = (None, None)  # (depth, rgb) last completed Kinect frame
+        self._extrapolation_thread = None
+        self._extrapolation_lock = threading.Lock()
+        self._extrapolation_ready = threading.Event()
+        self._pending_frame = None  # front buffer: written by capture
         
         # Performance tracking
         self.frame_count = 0
@@ -172,8 +265,13 @@ class Visual4CameraSystem:
         # Capture Kinect data
         if self.kinect_depth_active or self.kinect_rgb_active:
             try:
-                depth_data, _ = freenect.sync_get_depth()
-                rgb_data, _ = freenect.sync_get_video()
+                if self._kinect_thread is not None:
+                    # Latest frame published by the Kinect capture thread
+                    with self._kinect_lock:
+                        depth_data, rgb_data = self._kinect_latest
+                else:
+                    depth_data, _ = freenect.sync_get_depth()
+                    rgb_data, _ = freenect.sync_get_video()
                 
                 if depth_data is not None:
                     frame_data["kinect_depth"] = depth_data
@@ -186,58 +284,170 @@ class Visual4CameraSystem:
             except Exception as e:
                 print(f"Kinect capture error: {e}")
         
-        # Capture webcam data
+        # Capture webcam data (both reads in flight at once)
+        webcam_reads = {}
         if self.webcam1_active and self.webcam1_stream:
-            try:
-                grabbed, webcam1_frame = self.webcam1_stream.read()
-                if grabbed and webcam1_frame is not None:
-                    frame_data["webcam1"] = webcam1_frame
-                    frame_data["active_cameras"] += 1
-            except Exception as e:
-                print(f"Webcam 1 error: {e}")
-        
+            webcam_reads["webcam1"] = self._webcam_pool.submit(self.webcam1_stream.read)
         if self.webcam2_active and self.webcam2_stream:
+            webcam_reads["webcam2"] = self._webcam_pool.submit(self.webcam2_stream.read)
+
+        for name, future in webcam_reads.items():
             try:
-                grabbed, webcam2_frame = self.webcam2_stream.read()
-                if grabbed and webcam2_frame is not None:
-                    frame_data["webcam2"] = webcam2_frame
+                grabbed, webcam_frame = future.result()
+                if grabbed and webcam_frame is not None:
+                    frame_data[name] = webcam_frame
                     frame_data["active_cameras"] += 1
             except Exception as e:
-                print(f"Webcam 2 error: {e}")
+                print(f"Webcam {name[-1]} error: {e}")
         
         self.latest_frames = frame_data
 
         # Perform 3D extrapolation on captured data
-        self.perform_3d_extrapolation(frame_data)
+        if self._extrapolation_thread is not None:
+            self.submit_for_extrapolation(frame_data)
+        else:
+            self.perform_3d_extrapolation(frame_data)
 
         return frame_data
 
+    def start_pipeline(self):
+        """Run Kinect capture and 3D extrapolation on their own threads
+
+        Stage 1 (Kinect thread) keeps publishing the newest depth/RGB pair,
+        stage 2 (main loop) assembles frames and displays, stage 3
+        (extrapolation thread) processes the most recent assembled frame.
+        FPS is then bounded by the slowest stage rather than their sum.
+        """
+        if KINECT_AVAILABLE and (self.kinect_depth_active or self.kinect_rgb_active):
+            self._kinect_thread = threading.Thread(target=self._kinect_capture_loop, daemon=True)
+            self._kinect_thread.start()
+
+        self._extrapolation_thread = threading.Thread(target=self._extrapolation_loop, daemon=True)
+        self._extrapolation_thread.start()
+
+    def stop_pipeline(self):
+        """Stop the pipeline threads"""
+        self.running = False
+        self._extrapolation_ready.set()
+
+        for thread in (self._kinect_thread, self._extrapolation_thread):
+            if thread is not None:
+                thread.join(timeout=1.0)
+
+        self._kinect_thread = None
+        self._extrapolation_thread = None
+
+    def _kinect_capture_loop(self):
+        """Stage 1: continuously capture the Kinect and publish the newest frame"""
+        while self.running:
+            try:
+                depth_data, _ = freenect.sync_get_depth()
+                rgb_data, _ = freenect.sync_get_video()
+                with self._kinect_lock:
+                    self._kinect_latest = (depth_data, rgb_data)
+            except Exception as e:
+                print(f"Kinect capture error: {e}")
+                time.sleep(0.1)
+
+    def submit_for_extrapolation(self, frame_data):
+        """Hand a captured frame to the extrapolation thread (newest frame wins)"""
+        with self._extrapolation_lock:
+            self._pending_frame = frame_data
+        self._extrapolation_ready.set()
+
+    def _extrapolation_loop(self):
+        """Stage 3: run 3D extrapolation on the most recently submitted frame"""
+        while self.running:
+            self._extrapolation_ready.wait()
+
+            # Swap buffers: take the pending frame, leave the slot free for capture
+            with self._extrapolation_lock:
+                frame_data, self._pending_frame = self._pending_frame, None
+                self._extrapolation_ready.clear()
+
+            if frame_data is None:
+                continue
+
+            try:
+                self.perform_3d_extrapolation(frame_data)
+            except Exception as e:
+                print(f"3D extrapolation error: {e}")
+
+    def _create_stereo_matcher(self, num_disparities=96, block_size=15):
+        """Build and configure the stereo matcher once; returns (use_cuda, matcher)"""
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                return True, cv2.cuda.createStereoBM(numDisparities=num_disparities,
+                                                     blockSize=block_size)
+        except (AttributeError, cv2.error):
+            pass
+
+        matcher = cv2.StereoBM_create(numDisparities=num_disparities, blockSize=block_size)
+        matcher.setPreFilterCap(31)
+        return False, matcher
+
+    def _to_gray(self, frame, index):
+        """Convert a BGR frame to grayscale into a reused per-camera buffer"""
+        if frame.ndim == 2:
+            return frame
+
+        buf = self._gray_bufs[index]
+        if buf is None or buf.shape != frame.shape[:2]:
+            buf = np.empty(frame.shape[:2], dtype=np.uint8)
+            self._gray_bufs[index] = buf
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buf)
+        return buf
+
     def compute_stereo_depth(self, webcam1_frame, webcam2_frame):
         """Compute stereo depth from webcam pair"""
         if webcam1_frame is None or webcam2_frame is None:
             return None
 
-        # Convert to grayscale
-        gray1 = cv2.cvtColor(webcam1_frame, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(webcam2_frame, cv2.COLOR_BGR2GRAY)
+        # Convert to grayscale (frames that are already single-channel are used as-is)
+        gray1 = self._to_gray(webcam1_frame, 0)
+        gray2 = self._to_gray(webcam2_frame, 1)
+        full_size = (gray1.shape[1], gray1.shape[0])
 
-        # Create stereo matcher
-        stereo = cv2.StereoBM_create(numDisparities=96, blockSize=15)
+        # Block-match at reduced resolution: each pyrDown level cuts SAD work 4x
+        for _ in range(self.stereo_pyramid_levels):
+            gray1 = cv2.pyrDown(gray1)
+            gray2 = cv2.pyrDown(gray2)
 
         # Compute disparity
-        disparity = stereo.compute(gray1, gray2)
+        if self.use_cuda_stereo:
+            gpu1, gpu2 = cv2.cuda_GpuMat(), cv2.cuda_GpuMat()
+            gpu1.upload(gray1)
+            gpu2.upload(gray2)
+            disparity = self.stereo_matcher.compute(gpu1, gpu2, cv2.cuda_Stream.Null()).download()
+            disparity_scale = 1.0  # CUDA StereoBM returns integer disparities
+        else:
+            if self._disp_buf is None or self._disp_buf.shape != gray1.shape:
+                self._disp_buf = np.empty(gray1.shape, dtype=np.int16)
+            disparity = self.stereo_matcher.compute(gray1, gray2, disparity=self._disp_buf)
+            disparity_scale = 1.0 / 16.0  # CPU StereoBM returns 4-bit fixed point
 
-        # Convert to depth
-        focal_length = 800.0
+        # Convert to depth (focal length in pixels of the downsampled image)
+        focal_length = 800.0 / (2 ** self.stereo_pyramid_levels)
         baseline = 0.12  # 12cm between webcams
 
-        disparity_safe = np.where(disparity > 0, disparity, 1)
-        depth = (focal_length * baseline) / (disparity_safe / 16.0)
+        if self._depth_buf is None or self._depth_buf.shape != disparity.shape:
+            self._depth_buf = np.empty(disparity.shape, dtype=np.float32)
+        depth = self._depth_buf
+
+        # depth = f*b / (disparity*scale), computed in place on the float32 buffer
+        np.clip(disparity, 1, None, out=disparity)
+        np.multiply(disparity, np.float32(disparity_scale / (focal_length * baseline)), out=depth)
+        np.reciprocal(depth, out=depth)
+
+        # Filter realistic depths (0.1m - 3.0m) branchlessly
+        cv2.threshold(depth, 3.0, 0, cv2.THRESH_TOZERO_INV, dst=depth)
+        cv2.threshold(depth, 0.1, 0, cv2.THRESH_TOZERO, dst=depth)
 
-        # Filter realistic depths
-        depth_filtered = np.where((depth > 0.1) & (depth < 3.0), depth, 0)
+        # Back to the camera resolution so fusion and deprojection keep their intrinsics
+        if self.stereo_pyramid_levels > 0:
+            return cv2.resize(depth, full_size, interpolation=cv2.INTER_NEAREST)
 
-        return depth_filtered.astype(np.float32)
+        return depth.copy()
 
     def fuse_depth_sources(self, kinect_depth, stereo_depth):
         """Fuse Kinect and stereo depth for higher precision"""
@@ -248,31 +458,43 @@ class Visual4CameraSystem:
             return stereo_depth
 
         if stereo_depth is None:
-            return kinect_depth.astype(np.float32) / 1000.0  # Convert mm to m
+            return kinect_depth.astype(np.float32) * np.float32(0.001)  # Convert mm to m
 
-        # Resize to match
+        # Resize to match (nearest on the raw mm values, into reused buffers)
         h, w = stereo_depth.shape
-        kinect_resized = cv2.resize(kinect_depth.astype(np.float32) / 1000.0, (w, h))
+        if (self._kinect_raw_buf is None or self._kinect_raw_buf.shape != (h, w)
+                or self._kinect_raw_buf.dtype != kinect_depth.dtype):
+            self._kinect_raw_buf = np.empty((h, w), dtype=kinect_depth.dtype)
+        cv2.resize(kinect_depth, (w, h), dst=self._kinect_raw_buf, interpolation=cv2.INTER_NEAREST)
+
+        if NUMBA_AVAILABLE:
+            # One fused kernel: scale, mask and blend without temporaries
+            fused = np.empty((h, w), dtype=np.float32)
+            _fuse_depth(self._kinect_raw_buf, stereo_depth, fused)
+            return fused
+
+        if self._kinect_resized_buf is None or self._kinect_resized_buf.shape != (h, w):
+            self._kinect_resized_buf = np.empty((h, w), dtype=np.float32)
+        kinect_resized = self._kinect_resized_buf
+        np.multiply(self._kinect_raw_buf, np.float32(0.001), out=kinect_resized)  # mm to m
 
         # Weighted fusion (prefer Kinect where available)
         kinect_mask = kinect_resized > 0
         stereo_mask = stereo_depth > 0
 
-        fused = np.zeros_like(stereo_depth)
+        # Blend buffer for overlapping regions, reused across frames
+        if self._blend_buf is None or self._blend_buf.shape != stereo_depth.shape:
+            self._blend_buf = np.empty(stereo_depth.shape, dtype=np.float32)
+        blend = self._blend_buf
+        np.multiply(kinect_resized, 0.7, out=blend)
+        blend += 0.3 * stereo_depth
 
-        # Use Kinect where available (more accurate)
-        fused[kinect_mask] = kinect_resized[kinect_mask]
+        # Single streaming pass: blend on overlap, Kinect where available,
+        # stereo to fill gaps (stereo is already 0 where it has no data)
+        fused = np.where(kinect_mask & stereo_mask, blend,
+                         np.where(kinect_mask, kinect_resized, stereo_depth))
 
-        # Fill gaps with stereo
-        gap_mask = (~kinect_mask) & stereo_mask
-        fused[gap_mask] = stereo_depth[gap_mask]
-
-        # Blend overlapping regions
-        overlap_mask = kinect_mask & stereo_mask
-        fused[overlap_mask] = (0.7 * kinect_resized[overlap_mask] +
-                              0.3 * stereo_depth[overlap_mask])
-
-        return fused
+        return fused.astype(np.float32, copy=False)
 
     def create_3d_point_cloud(self, depth_data, rgb_data=None):
         """Create 3D point cloud from depth data"""
@@ -281,31 +503,48 @@ class Visual4CameraSystem:
 
         h, w = depth_data.shape
 
-        # Camera intrinsics (Kinect approximate)
-        fx, fy = 525.0, 525.0
-        cx, cy = w/2, h/2
-
-        # Create coordinate grids
-        u, v = np.meshgrid(np.arange(w), np.arange(h))
-
-        # Convert to 3D
-        z = depth_data
-        x = (u - cx) * z / fx
-        y = (v - cy) * z / fy
-
-        # Filter valid points
+        # Normalized pixel rays are constant for a given frame size
+        rays = self._xy_cache.get((h, w))
+        if rays is None:
+            cx, cy = w/2, h/2
+            u, v = np.meshgrid(np.arange(w, dtype=np.float32), np.arange(h, dtype=np.float32))
+            rays = (np.ascontiguousarray((u - cx) / self.fx, dtype=np.float32),
+                    np.ascontiguousarray((v - cy) / self.fy, dtype=np.float32))
+            self._xy_cache[(h, w)] = rays
+
+        if NUMBA_AVAILABLE:
+            # Fused deproject + filter kernel writing into a reused buffer
+            if self._points_buf is None or self._points_buf.shape[0] != h * w:
+                self._points_buf = np.empty((h * w, 3), dtype=np.float32)
+            z = np.ascontiguousarray(depth_data, dtype=np.float32)
+            count = _depth_to_points(z, rays[0], rays[1], self._points_buf)
+            if count == 0:
+                return None
+            return self._points_buf[:count]
+
+        z = depth_data.astype(np.float32, copy=False)
+
+        # Filter valid points (SIMD popcount on the uint8 view of the mask)
         valid_mask = z > 0
 
-        if np.sum(valid_mask) == 0:
+        if cv2.countNonZero(valid_mask.view(np.uint8)) == 0:
             return None
 
+        # Convert to 3D
+        x = rays[0] * z
+        y = rays[1] * z
+
         points = np.stack([x[valid_mask], y[valid_mask], z[valid_mask]], axis=1)
 
         return points
 
-    def create_precision_topography(self, points):
-        """Create high-precision topography grid"""
-        if points is None or len(points) < 10:
+    def create_precision_topography(self, points, depth_data):
+        """Create high-precision topography grid
+
+        The grid is resampled straight from the source depth image
+        (regular-grid spline interpolation) over the point cloud's extent.
+        """
+        if points is None or depth_data is None or len(points) < 10:
             return None
 
         # Extract coordinates
@@ -321,22 +560,28 @@ class Visual4CameraSystem:
             return None
 
         # Create grid
-        grid_x = np.arange(x_min, x_max, self.grid_resolution)
-        grid_y = np.arange(y_min, y_max, self.grid_resolution)
+        grid_x = np.arange(x_min, x_max, self.grid_resolution, dtype=np.float32)
+        grid_y = np.arange(y_min, y_max, self.grid_resolution, dtype=np.float32)
 
         # Limit grid size for performance
         if len(grid_x) > 500:
-            grid_x = np.linspace(x_min, x_max, 500)
+            grid_x = np.linspace(x_min, x_max, 500, dtype=np.float32)
         if len(grid_y) > 500:
-            grid_y = np.linspace(y_min, y_max, 500)
+            grid_y = np.linspace(y_min, y_max, 500, dtype=np.float32)
 
         grid_X, grid_Y = np.meshgrid(grid_x, grid_y)
 
         try:
-            # Interpolate Z values
-            grid_Z = griddata(
-                (x_coords, y_coords), z_coords,
-                (grid_X, grid_Y), method='cubic', fill_value=0
+            # Project the grid back into the depth image at the median depth
+            # and sample it there - no Delaunay triangulation needed
+            h, w = depth_data.shape
+            z_nominal = np.float32(np.median(z_coords))
+            u_coords = self.fx * grid_x / z_nominal + w / 2
+            v_coords = self.fy * grid_y / z_nominal + h / 2
+            u_grid, v_grid = np.meshgrid(u_coords, v_coords)
+            grid_Z = map_coordinates(
+                depth_data, [v_grid, u_grid],
+                order=3, mode='constant', cval=0
             )
 
             return {
@@ -371,9 +616,14 @@ class Visual4CameraSystem:
                 self.fused_depth, frame_data["kinect_rgb"]
             )
 
-            # Create precision topography
-            if self.point_cloud is not None:
-                self.topography_grid = self.create_precision_topography(self.point_cloud)
+            # Create precision topography (throttled; display keeps the last grid)
+            now = time.time()
+            if (self.point_cloud is not None and
+                    now - self._topo_last_ts >= self.topography_interval):
+                self._topo_last_ts = now
+                self.topography_grid = self.create_precision_topography(
+                    self.point_cloud, self.fused_depth
+                )
 
     def display_all_cameras(self, frame_data):
         """Display all camera feeds to keep Kinect active"""
@@ -384,14 +634,16 @@ class Visual4CameraSystem:
         # Kinect Depth
         if frame_data["kinect_depth"] is not None:
             depth = frame_data["kinect_depth"]
-            depth_display = (depth / depth.max() * 255).astype(np.uint8)
+            # Scale by the frame max in one saturating SIMD pass (no float temporaries)
+            _, depth_max, _, _ = cv2.minMaxLoc(depth)
+            depth_display = cv2.convertScaleAbs(depth, alpha=255.0 / max(depth_max, 1.0))
             depth_colored = cv2.applyColorMap(depth_display, cv2.COLORMAP_JET)
             depth_resized = cv2.resize(depth_colored, window_size)
             cv2.imshow('Kinect Depth', depth_resized)
         
         # Kinect RGB
         if frame_data["kinect_rgb"] is not None:
-            rgb = frame_data["kinect_rgb"]
+            rgb = cv2.UMat(frame_data["kinect_rgb"])
             rgb_bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
             rgb_resized = cv2.resize(rgb_bgr, window_size)
             cv2.imshow('Kinect RGB', rgb_resized)
@@ -406,11 +658,12 @@ class Visual4CameraSystem:
             webcam2_resized = cv2.resize(frame_data["webcam2"], window_size)
             cv2.imshow('Webcam 2', webcam2_resized)
 
-        # 3D Extrapolation Results
+        # 3D Extrapolation Results (UMat keeps the chain on OpenCL until imshow)
         if self.fused_depth is not None:
             # Fused depth visualization
-            depth_norm = cv2.normalize(self.fused_depth, None, 0, 255, cv2.NORM_MINMAX)
-            depth_colored = cv2.applyColorMap(depth_norm.astype(np.uint8), cv2.COLORMAP_JET)
+            depth_norm = cv2.normalize(cv2.UMat(self.fused_depth), None, 0, 255,
+                                       cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+            depth_colored = cv2.applyColorMap(depth_norm, cv2.COLORMAP_JET)
             depth_resized = cv2.resize(depth_colored, window_size)
             cv2.putText(depth_resized, "FUSED DEPTH", (5, 20),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
@@ -418,9 +671,9 @@ class Visual4CameraSystem:
 
         # Precision Topography
         if self.topography_grid is not None:
-            topo_Z = self.topography_grid['Z']
-            topo_norm = cv2.normalize(topo_Z, None, 0, 255, cv2.NORM_MINMAX)
-            topo_colored = cv2.applyColorMap(topo_norm.astype(np.uint8), cv2.COLORMAP_RAINBOW)
+            topo_Z = cv2.UMat(np.asarray(self.topography_grid['Z'], dtype=np.float32))
+            topo_norm = cv2.normalize(topo_Z, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+            topo_colored = cv2.applyColorMap(topo_norm, cv2.COLORMAP_RAINBOW)
             topo_resized = cv2.resize(topo_colored, window_size)
 
             # Add precision info
@@ -519,6 +772,8 @@ class Visual4CameraSystem:
         print(f"\n🎮 STARTING VISUAL DISPLAY LOOP...")
         print("Press 'q' to exit, 's' to save frame, 'p' to pause")
         
+        self.start_pipeline()
+
         try:
             while self.running:
                 # Capture from all cameras
@@ -567,6 +822,10 @@ class Visual4CameraSystem:
         """Clean up all resources"""
         print("\n🧹 CLEANING UP...")
         
+        # Stop pipeline threads before releasing the devices they read from
+        self.stop_pipeline()
+        self._webcam_pool.shutdown(wait=True)
+
         # Clean up OpenCV windows
         cv2.destroyAllWindows()
         
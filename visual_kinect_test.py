@@ -9,8 +9,11 @@ import numpy as np
 import time
 import sys
 
+from depth_colormap import build_depth_lut
+
 try:
     import freenect
+    from kinect_stream import ensure_kinect_started
     KINECT_AVAILABLE = True
     print("✅ Kinect library available")
 except ImportError:
@@ -26,7 +29,43 @@ class VisualKinectTest:
         self.kinect_active = False
         self.depth_frame = None
         self.rgb_frame = None
+        self.kinect_stream = None
+        
+        # Depth -> JET lookup table, rebuilt only when the depth range changes
+        self._depth_lut = None
+        self._depth_lut_max = None
+        self.depth_range_interval = 10  # Frames between max-depth refreshes
+        self._depth_frames_seen = 0
+        self._depth_max = None  # Smoothed (EMA) frame max
+        self.depth_max_smoothing = 0.1
+        
+        # Reused per-frame display buffers
+        self._depth_bgr = None
+        self._status_img = np.zeros((400, 600, 3), dtype=np.uint8)
         
+    def colorize_depth(self, depth_data):
+        """Colour a raw depth frame with JET scaled to its max, in one pass"""
+        # Display mapping doesn't need to track every frame; refresh every N
+        if self._depth_lut is None or self._depth_frames_seen % self.depth_range_interval == 0:
+            frame_max = float(depth_data.max())
+            if self._depth_max is None:
+                self._depth_max = frame_max
+            else:
+                self._depth_max += self.depth_max_smoothing * (frame_max - self._depth_max)
+            max_depth = int(self._depth_max)
+            if max_depth != self._depth_lut_max:
+                self._depth_lut = build_depth_lut(0, max_depth)
+                self._depth_lut_max = max_depth
+        self._depth_frames_seen += 1
+        
+        if self._depth_bgr is None or self._depth_bgr.shape[:2] != depth_data.shape:
+            self._depth_bgr = np.empty(depth_data.shape + (3,), dtype=np.uint8)
+        return np.take(self._depth_lut, depth_data, axis=0, out=self._depth_bgr)
+    
+    def rgb_to_bgr(self, rgb_data):
+        """BGR view of a Kinect RGB frame; reverses the channel stride, no pixels are copied"""
+        return rgb_data[..., ::-1]
+    
     def activate_kinect_with_display(self):
         """Activate Kinect by starting visual display"""
         print("🎮 ACTIVATING KINECT WITH VISUAL DISPLAY...")
@@ -42,31 +81,26 @@ class VisualKinectTest:
             
             print("   🔄 Starting Kinect streams...")
             
-            # Start streams
-            freenect.start_depth(0)
-            time.sleep(0.5)
-            freenect.start_video(0)
-            time.sleep(0.5)
+            # Start async streams; frames arrive via callbacks
+            self.kinect_stream = ensure_kinect_started()
             
             print("   ⏳ Waiting for Kinect to activate...")
             
             # Try to get data with visual feedback
-            for attempt in range(20):  # Try for 20 seconds
+            for attempt in range(20):  # Try for 20 frames
                 try:
                     print(f"      Attempt {attempt + 1}/20...")
                     
-                    # Get depth data
-                    depth_data, depth_timestamp = freenect.sync_get_depth()
-                    
-                    # Get RGB data
-                    rgb_data, rgb_timestamp = freenect.sync_get_video()
+                    # Frame-driven cadence: wake when the capture thread delivers
+                    self.kinect_stream.wait_for_frame(timeout=1.0)
+                    depth_data = self.kinect_stream.latest_depth()
+                    rgb_data = self.kinect_stream.latest_rgb()
                     
                     if depth_data is not None:
                         print(f"      ✅ Depth data: {depth_data.shape}")
                         
-                        # Convert depth to displayable format
-                        depth_display = (depth_data / depth_data.max() * 255).astype(np.uint8)
-                        depth_colored = cv2.applyColorMap(depth_display, cv2.COLORMAP_JET)
+                        # Single LUT gather: raw depth -> JET colour
+                        depth_colored = self.colorize_depth(depth_data)
                         
                         # Display depth
                         cv2.imshow('Kinect Depth', depth_colored)
@@ -80,7 +114,7 @@ class VisualKinectTest:
                         print(f"      ✅ RGB data: {rgb_data.shape}")
                         
                         # Convert RGB to BGR for OpenCV
-                        rgb_bgr = cv2.cvtColor(rgb_data, cv2.COLOR_RGB2BGR)
+                        rgb_bgr = self.rgb_to_bgr(rgb_data)
                         
                         # Display RGB
                         cv2.imshow('Kinect RGB', rgb_bgr)
@@ -100,13 +134,11 @@ class VisualKinectTest:
                         
                         return True
                     
-                    # Wait and check for exit
-                    key = cv2.waitKey(100) & 0xFF
+                    # Check for exit
+                    key = cv2.waitKey(1) & 0xFF
                     if key == ord('q'):
                         print("      🛑 User requested exit")
                         break
-                        
-                    time.sleep(0.5)
                     
                 except Exception as e:
                     print(f"      ❌ Attempt {attempt + 1} failed: {e}")
@@ -119,11 +151,9 @@ class VisualKinectTest:
             print(f"   ❌ Visual activation failed: {e}")
             return False
         finally:
-            # Clean up
+            # Clean up (stream keeps running for the comparison test)
             try:
                 cv2.destroyAllWindows()
-                freenect.stop_depth(0)
-                freenect.stop_video(0)
             except:
                 pass
     
@@ -137,6 +167,9 @@ class VisualKinectTest:
         
         if webcam_working:
             print("   ✅ Webcam available for comparison")
+            # Keep only the newest frame so the display doesn't lag behind
+            if not webcam.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                print("   ⚠️ Webcam backend ignored CAP_PROP_BUFFERSIZE")
         else:
             print("   ❌ Webcam not available")
         
@@ -157,11 +190,13 @@ class VisualKinectTest:
                 
                 # Try Kinect
                 try:
-                    depth_data, _ = freenect.sync_get_depth()
-                    rgb_data, _ = freenect.sync_get_video()
+                    self.kinect_stream = ensure_kinect_started()
+                    depth_data = self.kinect_stream.latest_depth(timeout=1.0)
+                    rgb_data = self.kinect_stream.latest_rgb(timeout=1.0)
                     
                     # Create status display
-                    status_img = np.zeros((400, 600, 3), dtype=np.uint8)
+                    status_img = self._status_img
+                    status_img.fill(0)
                     
                     # Status text
                     depth_status = "✅ WORKING" if depth_data is not None else "❌ FAILED"
@@ -186,24 +221,25 @@ class VisualKinectTest:
                     
                     # If we get data, show it
                     if depth_data is not None:
-                        depth_display = (depth_data / depth_data.max() * 255).astype(np.uint8)
-                        depth_colored = cv2.applyColorMap(depth_display, cv2.COLORMAP_JET)
+                        depth_colored = self.colorize_depth(depth_data)
                         cv2.imshow('Kinect Depth Live', depth_colored)
                     
                     if rgb_data is not None:
-                        rgb_bgr = cv2.cvtColor(rgb_data, cv2.COLOR_RGB2BGR)
+                        rgb_bgr = self.rgb_to_bgr(rgb_data)
                         cv2.imshow('Kinect RGB Live', rgb_bgr)
                     
                 except Exception as e:
                     print(f"      Kinect error: {e}")
                 
                 # Check for exit
-                key = cv2.waitKey(100) & 0xFF
+                key = cv2.waitKey(1) & 0xFF
                 if key == ord('q'):
                     print("   🛑 User requested exit")
                     break
                 
-                time.sleep(0.1)
+                # Frame-driven cadence instead of a fixed sleep
+                if self.kinect_stream is not None:
+                    self.kinect_stream.wait_for_frame(timeout=0.033)
         
         finally:
             if webcam_working:
@@ -246,6 +282,11 @@ class VisualKinectTest:
             print(f"   4. Test with voxel system")
         
         return success
+    
+    def cleanup(self):
+        """Stop the Kinect capture thread"""
+        if self.kinect_stream is not None:
+            self.kinect_stream.stop()
 
 def main():
     """Run visual Kinect test"""
@@ -257,6 +298,8 @@ def main():
     except Exception as e:
         print(f"❌ Visual test failed: {e}")
         return 1
+    finally:
+        test.cleanup()
 
 if __name__ == "__main__":
     sys.exit(main())
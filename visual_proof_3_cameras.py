@@ -7,20 +7,43 @@ Displays: Kinect Depth + Kinect RGB + Webcam in separate windows
 
 import cv2
 import numpy as np
-import time
 import sys
 import os
-from threading import Thread, Event
+from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor
+
+from depth_colormap import build_depth_lut
 
 # Import our working puzzle piece system
 try:
     import freenect
+    from kinect_stream import ensure_kinect_started
     KINECT_AVAILABLE = True
     print("✅ Kinect available for visual proof")
 except ImportError:
     KINECT_AVAILABLE = False
     print("❌ Kinect not available")
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    print("✅ Numba JIT available")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("⚠️ Numba not available - using NumPy depth colour path")
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _depth_to_jet_bgr(depth, out_bgr, lut):
+        """Write lut[depth] into the preallocated out_bgr, one row per thread"""
+        h, w = depth.shape
+        for i in prange(h):
+            for j in range(w):
+                v = depth[i, j]
+                out_bgr[i, j, 0] = lut[v, 0]
+                out_bgr[i, j, 1] = lut[v, 1]
+                out_bgr[i, j, 2] = lut[v, 2]
+
 class VisualProof3Cameras:
     """
     Visual proof system showing each camera output individually
@@ -34,10 +57,45 @@ class VisualProof3Cameras:
         
         # Camera streams
         self.webcam_stream = None
+        self.kinect_stream = None
+        self._kinect_frame = None  # KinectFrame shared by the depth and RGB displays
+        
+        # Webcam producer thread publishes only the newest frame
+        self._webcam_thread = None
+        self._webcam_stop = Event()
+        self._webcam_lock = Lock()
+        self._webcam_latest = None
         
         # Display control
         self.running = False
         self.display_thread = None
+        self._capture_pool = ThreadPoolExecutor(max_workers=3)
+        
+        # Depth -> JET lookup table, rebuilt only when the depth range changes
+        self._depth_lut = None
+        self._depth_lut_range = None
+        self.depth_range_interval = 10  # Frames between min/max refreshes
+        self._depth_min_max = None  # Smoothed (EMA) frame min/max
+        self.depth_range_smoothing = 0.1
+        
+        # Reused per-frame display buffers
+        self._depth_bgr = None
+        self._rgb_bgr = None
+        
+        # Windows show downsampled copies; capture keeps full resolution
+        self.display_size = (320, 240)
+        self._display_bufs = {}
+        self._shown_windows = set()
+        self.hidden_recheck_frames = 30  # Hidden windows are still shown every N loops
+        
+        # Display path uses the OpenCL T-API when a device is present
+        cv2.ocl.setUseOpenCL(True)
+        self.use_opencl = cv2.ocl.useOpenCL()
+        
+        # Cached label banners; the frame counter is only redrawn every N frames
+        self._overlays = {}
+        self.overlay_size = (100, 400)  # rows, cols covering the three label lines
+        self.overlay_refresh_frames = 5
         
         # Frame counters for proof
         self.kinect_depth_frames = 0
@@ -51,12 +109,14 @@ class VisualProof3Cameras:
         # Initialize Kinect (proven working)
         if KINECT_AVAILABLE:
             try:
-                depth_frame = freenect.sync_get_depth()[0]
+                self.kinect_stream = ensure_kinect_started()
+                
+                depth_frame = self.kinect_stream.latest_depth(timeout=2.0)
                 if depth_frame is not None:
                     self.kinect_depth_active = True
                     print("   ✅ Kinect depth sensor ready for proof")
                 
-                rgb_frame = freenect.sync_get_video()[0]
+                rgb_frame = self.kinect_stream.latest_rgb(timeout=2.0)
                 if rgb_frame is not None:
                     self.kinect_rgb_active = True
                     print("   ✅ Kinect RGB camera ready for proof")
@@ -72,10 +132,16 @@ class VisualProof3Cameras:
                 cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 cap.set(cv2.CAP_PROP_FPS, 30)
                 
+                # Keep only the newest frame so the display doesn't lag behind
+                if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                    print("   ⚠️ Webcam backend ignored CAP_PROP_BUFFERSIZE")
+                
                 ret, test_frame = cap.read()
                 if ret and test_frame is not None:
                     self.webcam_stream = cap
                     self.webcam_active = True
+                    self._webcam_thread = Thread(target=self._webcam_capture_loop, daemon=True)
+                    self._webcam_thread.start()
                     print("   ✅ Webcam ready for proof")
                 else:
                     cap.release()
@@ -92,33 +158,74 @@ class VisualProof3Cameras:
         
         return active_count == 3
     
+    def _stamp_overlay(self, frame, title, frame_count, title_color, info_lines):
+        """Blit a cached label sprite onto frame; static lines are drawn once, the counter every N frames"""
+        key = (title, frame.shape[:2])
+        sprite = self._overlays.get(key)
+        if sprite is None:
+            # Colour sprite plus a mask of the glyph pixels, so only text is copied
+            sprite = (np.zeros(self.overlay_size + (3,), dtype=np.uint8),
+                      np.zeros(self.overlay_size, dtype=np.uint8))
+            for text, y, color in info_lines:
+                cv2.putText(sprite[0], text, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+                cv2.putText(sprite[1], text, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, 255, 1)
+            self._overlays[key] = sprite
+            frame_count_due = True
+        else:
+            frame_count_due = frame_count % self.overlay_refresh_frames == 0
+        
+        sprite_bgr, sprite_mask = sprite
+        if frame_count_due:
+            # Cover the previous counter instead of redrawing the whole sprite
+            text = f"{title} - Frame {frame_count}"
+            cv2.rectangle(sprite_bgr, (0, 0), (sprite_bgr.shape[1] - 1, 40), (0, 0, 0), -1)
+            cv2.rectangle(sprite_mask, (0, 0), (sprite_mask.shape[1] - 1, 40), 0, -1)
+            cv2.putText(sprite_bgr, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, title_color, 2)
+            cv2.putText(sprite_mask, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 255, 2)
+        
+        # Masked copy works on strided views (e.g. the BGR view of Kinect RGB)
+        h = min(sprite_bgr.shape[0], frame.shape[0])
+        w = min(sprite_bgr.shape[1], frame.shape[1])
+        np.copyto(frame[:h, :w], sprite_bgr[:h, :w], where=sprite_mask[:h, :w, None].astype(bool))
+    
     def capture_kinect_depth_frame(self):
         """Capture and process Kinect depth frame for display"""
         if not self.kinect_depth_active or not KINECT_AVAILABLE:
             return None
         
         try:
-            # Get raw depth frame
-            depth_frame = freenect.sync_get_depth()[0]
+            # Depth half of this iteration's shared Kinect snapshot
+            depth_frame = self._kinect_frame.depth if self._kinect_frame is not None else None
             if depth_frame is None:
                 return None
             
-            # Convert depth to displayable format
-            # Normalize depth values to 0-255 for visualization
-            depth_normalized = cv2.normalize(depth_frame, None, 0, 255, cv2.NORM_MINMAX)
-            depth_display = depth_normalized.astype(np.uint8)
-            
-            # Apply colormap for better visualization
-            depth_colored = cv2.applyColorMap(depth_display, cv2.COLORMAP_JET)
+            # Min-max normalize and apply JET in a single LUT gather;
+            # the range is only re-measured every N frames
+            if self._depth_lut is None or self.kinect_depth_frames % self.depth_range_interval == 0:
+                min_val, max_val, _, _ = cv2.minMaxLoc(depth_frame)
+                if self._depth_min_max is None:
+                    self._depth_min_max = [min_val, max_val]
+                else:
+                    # EMA keeps the colour scale steady against per-frame noise
+                    self._depth_min_max[0] += self.depth_range_smoothing * (min_val - self._depth_min_max[0])
+                    self._depth_min_max[1] += self.depth_range_smoothing * (max_val - self._depth_min_max[1])
+                depth_range = (int(self._depth_min_max[0]), int(self._depth_min_max[1]))
+                if depth_range != self._depth_lut_range:
+                    self._depth_lut = build_depth_lut(*depth_range)
+                    self._depth_lut_range = depth_range
+            if self._depth_bgr is None or self._depth_bgr.shape[:2] != depth_frame.shape:
+                self._depth_bgr = np.empty(depth_frame.shape + (3,), dtype=np.uint8)
+            if NUMBA_AVAILABLE:
+                _depth_to_jet_bgr(depth_frame, self._depth_bgr, self._depth_lut)
+            else:
+                np.take(self._depth_lut, depth_frame, axis=0, out=self._depth_bgr)
+            depth_colored = self._depth_bgr
             
             # Add frame counter and info
             self.kinect_depth_frames += 1
-            cv2.putText(depth_colored, f"KINECT DEPTH - Frame {self.kinect_depth_frames}", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(depth_colored, f"Resolution: {depth_frame.shape[1]}x{depth_frame.shape[0]}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(depth_colored, f"Axis 1 - Side View", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            self._stamp_overlay(depth_colored, "KINECT DEPTH", self.kinect_depth_frames, (255, 255, 255),
+                                [("Resolution: {}x{}".format(depth_frame.shape[1], depth_frame.shape[0]), 60, (255, 255, 255)),
+                                 ("Axis 1 - Side View", 90, (0, 255, 0))])
             
             return depth_colored
             
@@ -132,22 +239,23 @@ class VisualProof3Cameras:
             return None
         
         try:
-            # Get RGB frame
-            rgb_frame = freenect.sync_get_video()[0]
+            # RGB half of this iteration's shared Kinect snapshot
+            rgb_frame = self._kinect_frame.rgb if self._kinect_frame is not None else None
             if rgb_frame is None:
                 return None
             
-            # Convert RGB to BGR for OpenCV display
-            bgr_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+            # The snapshot is the stream's own array and is handed out again until the next
+            # Kinect frame, so the overlay is stamped on a reused display buffer instead
+            if self._rgb_bgr is None or self._rgb_bgr.shape != rgb_frame.shape:
+                self._rgb_bgr = np.empty(rgb_frame.shape, dtype=np.uint8)
+            bgr_frame = self._rgb_bgr
+            np.copyto(bgr_frame, rgb_frame[..., ::-1])
             
             # Add frame counter and info
             self.kinect_rgb_frames += 1
-            cv2.putText(bgr_frame, f"KINECT RGB - Frame {self.kinect_rgb_frames}", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(bgr_frame, f"Resolution: {rgb_frame.shape[1]}x{rgb_frame.shape[0]}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            cv2.putText(bgr_frame, f"Axis 1 - Side View", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            self._stamp_overlay(bgr_frame, "KINECT RGB", self.kinect_rgb_frames, (0, 255, 0),
+                                [("Resolution: {}x{}".format(rgb_frame.shape[1], rgb_frame.shape[0]), 60, (0, 255, 0)),
+                                 ("Axis 1 - Side View", 90, (0, 255, 0))])
             
             return bgr_frame
             
@@ -155,25 +263,34 @@ class VisualProof3Cameras:
             print(f"Kinect RGB capture error: {e}")
             return None
     
+    def _webcam_capture_loop(self):
+        """Producer: read the webcam continuously, keeping only the latest frame"""
+        while not self._webcam_stop.is_set():
+            ret, frame = self.webcam_stream.read()
+            if not ret or frame is None:
+                self._webcam_stop.wait(0.01)  # Don't spin on a stalled camera
+                continue
+            with self._webcam_lock:
+                self._webcam_latest = frame
+    
     def capture_webcam_frame(self):
         """Capture and process webcam frame for display"""
         if not self.webcam_active or not self.webcam_stream:
             return None
         
         try:
-            # Get webcam frame
-            ret, webcam_frame = self.webcam_stream.read()
-            if not ret or webcam_frame is None:
+            # Take the newest frame from the producer thread (non-blocking)
+            with self._webcam_lock:
+                webcam_frame = self._webcam_latest
+                self._webcam_latest = None
+            if webcam_frame is None:
                 return None
             
             # Add frame counter and info
             self.webcam_frames += 1
-            cv2.putText(webcam_frame, f"WEBCAM - Frame {self.webcam_frames}", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            cv2.putText(webcam_frame, f"Resolution: {webcam_frame.shape[1]}x{webcam_frame.shape[0]}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            cv2.putText(webcam_frame, f"Axis 2 - Different View", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+            self._stamp_overlay(webcam_frame, "WEBCAM", self.webcam_frames, (0, 0, 255),
+                                [("Resolution: {}x{}".format(webcam_frame.shape[1], webcam_frame.shape[0]), 60, (0, 0, 255)),
+                                 ("Axis 2 - Different View", 90, (0, 0, 255))])
             
             return webcam_frame
             
@@ -181,6 +298,33 @@ class VisualProof3Cameras:
             print(f"Webcam capture error: {e}")
             return None
     
+    def _downsample_for_display(self, name, frame):
+        """Shrink a frame to display_size before imshow (OpenCL UMat or a reused buffer)"""
+        width, height = self.display_size
+        if frame.shape[1] <= width and frame.shape[0] <= height:
+            return frame
+        
+        if self.use_opencl:
+            # Stays on the device until imshow pulls it back
+            return cv2.resize(cv2.UMat(frame), (width, height), interpolation=cv2.INTER_AREA)
+        
+        shape = (height, width) + frame.shape[2:]
+        buf = self._display_bufs.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=frame.dtype)
+            self._display_bufs[name] = buf
+        return cv2.resize(frame, (width, height), dst=buf, interpolation=cv2.INTER_AREA)
+    
+    def _window_hidden(self, window):
+        """True once a window has been shown and the backend reports it as not visible.
+        Only 0 counts: -1 means the backend doesn't support the property."""
+        if window not in self._shown_windows:
+            return False
+        try:
+            return cv2.getWindowProperty(window, cv2.WND_PROP_VISIBLE) == 0
+        except cv2.error:
+            return False
+    
     def display_all_cameras(self):
         """Display all 3 camera outputs in separate windows"""
         print("\n📺 STARTING VISUAL PROOF DISPLAY...")
@@ -188,22 +332,35 @@ class VisualProof3Cameras:
         print("   Each camera will show in a separate window")
         
         self.running = True
+        sources = [
+            ("PROOF: Kinect Depth Sensor (Axis 1)", self.capture_kinect_depth_frame),
+            ("PROOF: Kinect RGB Camera (Axis 1)", self.capture_kinect_rgb_frame),
+            ("PROOF: Webcam (Axis 2)", self.capture_webcam_frame),
+        ]
         
+        loop_count = 0
         while self.running:
-            # Capture frames from all cameras
-            depth_frame = self.capture_kinect_depth_frame()
-            rgb_frame = self.capture_kinect_rgb_frame()
-            webcam_frame = self.capture_webcam_frame()
-            
-            # Display each camera in separate window
-            if depth_frame is not None:
-                cv2.imshow("PROOF: Kinect Depth Sensor (Axis 1)", depth_frame)
+            # Capture frames concurrently (latency = slowest, not sum),
+            # skipping sources whose window is minimized/hidden; every Nth loop
+            # they are shown anyway so a restored or closed window comes back
+            # and its frame counter keeps moving for the proof report
+            # One matched depth/RGB snapshot serves both Kinect windows
+            if self.kinect_stream is not None:
+                self._kinect_frame = self.kinect_stream.latest_frame()
             
-            if rgb_frame is not None:
-                cv2.imshow("PROOF: Kinect RGB Camera (Axis 1)", rgb_frame)
+            recheck = loop_count % self.hidden_recheck_frames == 0
+            loop_count += 1
+            futures = {}
+            for window, capture in sources:
+                if recheck or not self._window_hidden(window):
+                    futures[window] = self._capture_pool.submit(capture)
             
-            if webcam_frame is not None:
-                cv2.imshow("PROOF: Webcam (Axis 2)", webcam_frame)
+            # Display each camera in separate window
+            for window, future in futures.items():
+                frame = future.result()
+                if frame is not None:
+                    cv2.imshow(window, self._downsample_for_display(window, frame))
+                    self._shown_windows.add(window)
             
             # Check for quit key
             key = cv2.waitKey(1) & 0xFF
@@ -211,8 +368,9 @@ class VisualProof3Cameras:
                 print("\n🛑 User requested quit")
                 break
             
-            # Small delay to prevent overwhelming the system
-            time.sleep(0.033)  # ~30 FPS
+            # Pace the loop on Kinect frame arrival (~30 FPS) instead of a fixed sleep
+            if self.kinect_stream is not None:
+                self.kinect_stream.wait_for_frame(timeout=0.033)
         
         # Close all windows
         cv2.destroyAllWindows()
@@ -269,8 +427,7 @@ class VisualProof3Cameras:
         print(f"   1. Kinect Depth Sensor (colorized depth data)")
         print(f"   2. Kinect RGB Camera (color video)")
         print(f"   3. Webcam (color video from different angle)")
-        
-        input("\nPress ENTER to start visual proof display...")
+        print(f"\n▶️ Starting visual proof display...")
         
         try:
             # Display all cameras
@@ -294,6 +451,17 @@ class VisualProof3Cameras:
         
         self.running = False
         
+        self._capture_pool.shutdown(wait=True)
+        
+        if self.kinect_stream is not None:
+            self.kinect_stream.stop()
+            print("   ✅ Kinect stream stopped")
+        
+        self._webcam_stop.set()
+        if self._webcam_thread is not None:
+            self._webcam_thread.join(timeout=1.0)
+            self._webcam_thread = None
+        
         if self.webcam_stream:
             try:
                 self.webcam_stream.release()
@@ -10,40 +10,153 @@ import numpy as np
 import time
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
 
 # Import our working 4-camera system
 try:
     import freenect
+    from kinect_stream import ensure_kinect_started
     KINECT_AVAILABLE = True
     print("✅ Kinect available for visual proof")
 except ImportError:
     KINECT_AVAILABLE = False
     print("❌ Kinect not available")
 
+class _LatestFrameSlot:
+    """Single-slot holder for the newest frame published by one capture thread"""
+    
+    def __init__(self):
+        self.frame = None
+        self.counter = 0
+        self.captured_ns = 0
+        self.lock = threading.Lock()
+        self._seen = 0
+    
+    def put(self, frame):
+        """Replace the held frame (older frames are simply dropped)"""
+        captured_ns = time.monotonic_ns()
+        with self.lock:
+            self.frame = frame
+            self.counter += 1
+            self.captured_ns = captured_ns
+    
+    def pending(self):
+        """True while the held frame hasn't been taken by snapshot() yet"""
+        with self.lock:
+            return self.counter != self._seen
+    
+    def discard(self):
+        """Drop the held frame so the next snapshot only sees a newer one"""
+        with self.lock:
+            self.frame = None
+            self._seen = self.counter
+    
+    def snapshot(self):
+        """Return (frame, counter, captured_ns); frame is None if nothing new since the last snapshot"""
+        with self.lock:
+            if self.counter == self._seen:
+                return None, self.counter, self.captured_ns
+            self._seen = self.counter
+            return self.frame, self.counter, self.captured_ns
+
+@dataclass
+class CamDesc:
+    """One proof camera: where its frames come from and how its tile is labelled"""
+    name: str
+    report_name: str
+    slot: _LatestFrameSlot
+    text_color: Tuple[int, int, int]
+    resolution_color: Tuple[int, int, int]
+    axis_color: Tuple[int, int, int]
+    axis_label: str
+    to_display: Optional[Callable] = None  # e.g. RGB -> BGR copy, applied before annotating
+    decimate: int = 1  # Refresh the tile every Nth display iteration
+    active: bool = False
+    frames: int = 0
+    stale_frames: int = 0
+    
+    def __post_init__(self):
+        self.prefix = self.name + " - Frame "
+
 class VisualProof4Cameras:
     """
     Visual proof system showing each of the 4 cameras individually
     """
     
     def __init__(self):
-        # Camera states
-        self.kinect_depth_active = False
-        self.kinect_rgb_active = False
-        self.webcam1_active = False
-        self.webcam2_active = False
-        
         # Camera streams
         self.webcam1_stream = None
         self.webcam2_stream = None
+        self.webcam_height = 360  # Webcams only feed a mosaic tile; Kinect stays native
+        self.kinect_stream = None
         
         # Display control
         self.running = False
+        self.frame_interval = 1.0 / 30
+        self.rgb_decimate = 15  # Kinect RGB tile refresh: every 15th iteration (~2 FPS)
+        
+        # 2x2 mosaic: depth | rgb / webcam 1 | webcam 2, one imshow per frame
+        self.tile_size = (640, 480)  # width, height
+        self._mosaic = np.zeros((self.tile_size[1] * 2, self.tile_size[0] * 2, 3), dtype=np.uint8)
+        
+        # Image ops use the OpenCL T-API when a device is present
+        cv2.ocl.setUseOpenCL(cv2.ocl.haveOpenCL())
+        self.use_opencl = cv2.ocl.useOpenCL()
+        
+        # One producer thread per camera, each publishing into its own slot
+        self._depth_slot = _LatestFrameSlot()
+        self._rgb_slot = _LatestFrameSlot()
+        self._webcam1_slot = _LatestFrameSlot()
+        self._webcam2_slot = _LatestFrameSlot()
+        self._capture_threads = []
+        self._capture_stop = threading.Event()
+        self._annotate_pool = ThreadPoolExecutor(max_workers=4)
+        
+        # Fixed depth -> 8-bit mapping over the Kinect v1 working range (mm);
+        # one gather per frame and a colour scale that doesn't jitter
+        self.depth_min_mm = 500
+        self.depth_max_mm = 4000
+        self._depth_lut = np.clip((np.arange(65536, dtype=np.float32) - self.depth_min_mm) *
+                                  (255.0 / (self.depth_max_mm - self.depth_min_mm)), 0, 255).astype(np.uint8)
+        # Fold the JET colormap in too: raw depth -> BGR in a single gather
+        jet = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(256, 1), cv2.COLORMAP_JET).reshape(256, 3)
+        self._depth_bgr_lut = jet[self._depth_lut]
+        
+        # Small ring of reused colour buffers for the depth callback. The display
+        # copies a snapshot into the mosaic within one iteration, long before
+        # the producer wraps around to that buffer again.
+        self._depth_bgr_bufs = [None, None, None]
+        self._depth_bgr_index = 0
+        
+        # Kinect RGB is copied into this BGR buffer before annotating; the
+        # published frame is the KinectStream's own array and stays untouched
+        self._rgb_display_buf = None
+        
+        # Static label lines are cached per camera; only the counter is drawn per frame
+        self._static_overlays = {}
+        self.overlay_band_height = 100
+        
+        # Frames shown after sitting in their slot too long count as stale, not fresh
+        self.stale_after_ns = 66_000_000
         
-        # Frame counters for proof
-        self.kinect_depth_frames = 0
-        self.kinect_rgb_frames = 0
-        self.webcam1_frames = 0
-        self.webcam2_frames = 0
+        # Camera states, labels and frame counters; list order is mosaic tile order
+        self.kinect_depth_cam = CamDesc("KINECT DEPTH", "Kinect Depth Sensor", self._depth_slot,
+                                        (255, 255, 255), (255, 255, 255), (0, 255, 0),
+                                        "Axis 1 - Side View [REQUIRED]")
+        self.kinect_rgb_cam = CamDesc("KINECT RGB", "Kinect RGB Camera", self._rgb_slot,
+                                      (0, 255, 0), (0, 255, 0), (0, 255, 0),
+                                      "Axis 1 - Side View [REQUIRED]",
+                                      to_display=self._rgb_to_display, decimate=self.rgb_decimate)
+        self.webcam1_cam = CamDesc("WEBCAM 1", "Webcam 1", self._webcam1_slot,
+                                   (0, 0, 255), (0, 0, 255), (0, 0, 255),
+                                   "Axis 2 - Secondary View [REQUIRED]")
+        self.webcam2_cam = CamDesc("WEBCAM 2", "Webcam 2", self._webcam2_slot,
+                                   (255, 0, 255), (255, 0, 255), (255, 0, 255),
+                                   "Axis 3 - Additional View [OPTIONAL]")
+        self._cams = [self.kinect_depth_cam, self.kinect_rgb_cam, self.webcam1_cam, self.webcam2_cam]
         
     def initialize_cameras_for_proof(self):
         """Initialize all cameras using our proven working method"""
@@ -52,31 +165,46 @@ class VisualProof4Cameras:
         # Initialize Kinect (proven working)
         if KINECT_AVAILABLE:
             try:
-                depth_frame = freenect.sync_get_depth()[0]
+                # Async freenect stream: depth and RGB arrive via callbacks
+                self.kinect_stream = ensure_kinect_started()
+                
+                depth_frame = self.kinect_stream.latest_depth(timeout=2.0)
                 if depth_frame is not None:
-                    self.kinect_depth_active = True
+                    self.kinect_depth_cam.active = True
+                    self.kinect_stream.depth_listeners.append(self._on_kinect_depth)
                     print("   ✅ Kinect depth sensor ready for proof")
                 
-                rgb_frame = freenect.sync_get_video()[0]
+                rgb_frame = self.kinect_stream.latest_rgb(timeout=2.0)
                 if rgb_frame is not None:
-                    self.kinect_rgb_active = True
+                    self.kinect_rgb_cam.active = True
+                    self.kinect_stream.rgb_listeners.append(self._on_kinect_rgb)
                     print("   ✅ Kinect RGB camera ready for proof")
                     
             except Exception as e:
                 print(f"   ❌ Kinect initialization failed: {e}")
         
-        # Initialize webcam 1 (using proven DirectShow method)
+        # Initialize webcam 1 (lowest-latency backend that opens)
         try:
-            cap1 = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-            if cap1.isOpened():
+            cap1 = self._open_webcam(0, "Webcam 1")
+            if cap1 is not None:
+                # Newest-frame-only driver queue, MJPG transport (smaller USB frames)
+                if not cap1.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                    print("   ⚠️ Webcam 1 backend ignored CAP_PROP_BUFFERSIZE")
+                cap1.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                if int(cap1.get(cv2.CAP_PROP_FOURCC)) != cv2.VideoWriter_fourcc(*'MJPG'):
+                    print("   ⚠️ Webcam 1 driver rejected MJPG, using its default format")
                 cap1.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                cap1.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                # 640x360 is enough for a mosaic tile; fall back if the driver refuses
+                cap1.set(cv2.CAP_PROP_FRAME_HEIGHT, self.webcam_height)
+                if int(cap1.get(cv2.CAP_PROP_FRAME_HEIGHT)) != self.webcam_height:
+                    cap1.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 cap1.set(cv2.CAP_PROP_FPS, 30)
                 
                 ret, test_frame = cap1.read()
                 if ret and test_frame is not None:
                     self.webcam1_stream = cap1
-                    self.webcam1_active = True
+                    self.webcam1_cam.active = True
+                    self._start_capture_thread(self._read_webcam1, self._webcam1_slot)
                     print("   ✅ Webcam 1 ready for proof")
                 else:
                     cap1.release()
@@ -87,18 +215,28 @@ class VisualProof4Cameras:
         except Exception as e:
             print(f"   ❌ Webcam 1 initialization failed: {e}")
         
-        # Initialize webcam 2 (using proven DirectShow method)
+        # Initialize webcam 2 (lowest-latency backend that opens)
         try:
-            cap2 = cv2.VideoCapture(1, cv2.CAP_DSHOW)
-            if cap2.isOpened():
+            cap2 = self._open_webcam(1, "Webcam 2")
+            if cap2 is not None:
+                # Newest-frame-only driver queue, MJPG transport (smaller USB frames)
+                if not cap2.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                    print("   ⚠️ Webcam 2 backend ignored CAP_PROP_BUFFERSIZE")
+                cap2.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                if int(cap2.get(cv2.CAP_PROP_FOURCC)) != cv2.VideoWriter_fourcc(*'MJPG'):
+                    print("   ⚠️ Webcam 2 driver rejected MJPG, using its default format")
                 cap2.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                cap2.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                # 640x360 is enough for a mosaic tile; fall back if the driver refuses
+                cap2.set(cv2.CAP_PROP_FRAME_HEIGHT, self.webcam_height)
+                if int(cap2.get(cv2.CAP_PROP_FRAME_HEIGHT)) != self.webcam_height:
+                    cap2.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 cap2.set(cv2.CAP_PROP_FPS, 30)
                 
                 ret, test_frame = cap2.read()
                 if ret and test_frame is not None:
                     self.webcam2_stream = cap2
-                    self.webcam2_active = True
+                    self.webcam2_cam.active = True
+                    self._start_capture_thread(self._read_webcam2, self._webcam2_slot)
                     print("   ✅ Webcam 2 ready for proof")
                 else:
                     cap2.release()
@@ -110,161 +248,221 @@ class VisualProof4Cameras:
             print(f"   ❌ Webcam 2 initialization failed: {e}")
         
         # Report initialization results
-        active_count = sum([self.kinect_depth_active, self.kinect_rgb_active, self.webcam1_active, self.webcam2_active])
+        active_count = sum(cam.active for cam in self._cams)
         print(f"\n📊 CAMERAS READY FOR PROOF: {active_count}/4")
         
         return active_count >= 3  # Minimum 3 cameras for proof
     
-    def capture_kinect_depth_frame(self):
-        """Capture and process Kinect depth frame for display"""
-        if not self.kinect_depth_active or not KINECT_AVAILABLE:
-            return None
-        
-        try:
-            # Get raw depth frame
-            depth_frame = freenect.sync_get_depth()[0]
-            if depth_frame is None:
-                return None
-            
-            # Convert depth to displayable format
-            depth_normalized = cv2.normalize(depth_frame, None, 0, 255, cv2.NORM_MINMAX)
-            depth_display = depth_normalized.astype(np.uint8)
-            
-            # Apply colormap for better visualization
-            depth_colored = cv2.applyColorMap(depth_display, cv2.COLORMAP_JET)
-            
-            # Add frame counter and info
-            self.kinect_depth_frames += 1
-            cv2.putText(depth_colored, f"KINECT DEPTH - Frame {self.kinect_depth_frames}", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(depth_colored, f"Resolution: {depth_frame.shape[1]}x{depth_frame.shape[0]}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(depth_colored, f"Axis 1 - Side View [REQUIRED]", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            
-            return depth_colored
-            
-        except Exception as e:
-            print(f"Kinect depth capture error: {e}")
-            return None
+    @staticmethod
+    def _webcam_backends():
+        """Capture backends to try, in order of preference, for this platform"""
+        if sys.platform.startswith('win'):
+            # MSMF honours CAP_PROP_BUFFERSIZE; DirectShow is the proven fallback
+            return [("MSMF", cv2.CAP_MSMF), ("DirectShow", cv2.CAP_DSHOW)]
+        if sys.platform.startswith('linux'):
+            return [("V4L2", cv2.CAP_V4L2), ("default", cv2.CAP_ANY)]
+        return [("default", cv2.CAP_ANY)]
     
-    def capture_kinect_rgb_frame(self):
-        """Capture and process Kinect RGB frame for display"""
-        if not self.kinect_rgb_active or not KINECT_AVAILABLE:
-            return None
-        
+    def _open_webcam(self, index, label):
+        """Open a webcam on the first backend that works; None if none do"""
+        for backend_name, backend in self._webcam_backends():
+            cap = cv2.VideoCapture(index, backend)
+            if cap.isOpened():
+                print(f"   📷 {label} using {backend_name} backend")
+                return cap
+            cap.release()
+        return None
+    
+    def _start_capture_thread(self, read_frame, slot):
+        """Launch a daemon producer that keeps slot filled with the newest frame"""
+        thread = threading.Thread(target=self._capture_loop, args=(read_frame, slot), daemon=True)
+        thread.start()
+        self._capture_threads.append(thread)
+    
+    def _capture_loop(self, read_frame, slot):
+        """Producer body: read continuously, publishing each frame into slot"""
+        while not self._capture_stop.is_set():
+            try:
+                frame = read_frame()
+            except Exception as e:
+                print(f"Capture thread error: {e}")
+                frame = None
+            if frame is None:
+                self._capture_stop.wait(0.01)  # Don't spin on a stalled camera
+                continue
+            slot.put(frame)
+    
+    def _on_kinect_depth(self, depth_frame, timestamp):
+        """Kinect depth callback: colorize and publish into the depth slot"""
         try:
-            # Get RGB frame
-            rgb_frame = freenect.sync_get_video()[0]
-            if rgb_frame is None:
-                return None
-            
-            # Convert RGB to BGR for OpenCV display
-            bgr_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
-            
-            # Add frame counter and info
-            self.kinect_rgb_frames += 1
-            cv2.putText(bgr_frame, f"KINECT RGB - Frame {self.kinect_rgb_frames}", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(bgr_frame, f"Resolution: {rgb_frame.shape[1]}x{rgb_frame.shape[0]}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            cv2.putText(bgr_frame, f"Axis 1 - Side View [REQUIRED]", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            
-            return bgr_frame
-            
+            # Raw depth -> JET colour in one LUT gather (no normalize/applyColorMap),
+            # written into the next ring buffer instead of a fresh allocation
+            i = self._depth_bgr_index = (self._depth_bgr_index + 1) % len(self._depth_bgr_bufs)
+            buf = self._depth_bgr_bufs[i]
+            if buf is None or buf.shape[:2] != depth_frame.shape:
+                buf = self._depth_bgr_bufs[i] = np.empty(depth_frame.shape + (3,), dtype=np.uint8)
+            np.take(self._depth_bgr_lut, depth_frame, axis=0, out=buf)
+            self._depth_slot.put(buf)
         except Exception as e:
-            print(f"Kinect RGB capture error: {e}")
-            return None
+            print(f"Kinect depth callback error: {e}")
+    
+    def _on_kinect_rgb(self, rgb_frame, timestamp):
+        """Kinect video callback: publish the RGB frame as-is (BGR view taken at display)"""
+        self._rgb_slot.put(rgb_frame)
+    
+    def _rgb_to_display(self, rgb_frame):
+        """Copy a Kinect RGB frame into the reused BGR display buffer"""
+        if self._rgb_display_buf is None or self._rgb_display_buf.shape != rgb_frame.shape:
+            self._rgb_display_buf = np.empty(rgb_frame.shape, dtype=np.uint8)
+        np.copyto(self._rgb_display_buf, rgb_frame[..., ::-1])
+        return self._rgb_display_buf
     
-    def capture_webcam1_frame(self):
-        """Capture and process webcam 1 frame for display"""
-        if not self.webcam1_active or not self.webcam1_stream:
+    def _read_webcam(self, stream, slot):
+        """Read one webcam frame, decoding only frames the display will take"""
+        if not stream.grab():
             return None
-        
-        try:
-            # Get webcam frame
-            ret, webcam_frame = self.webcam1_stream.read()
-            if not ret or webcam_frame is None:
+        # While the display hasn't taken the previous frame, keep fetching
+        # without decoding; only the newest grabbed frame gets retrieved
+        while slot.pending() and not self._capture_stop.is_set():
+            if not stream.grab():
                 return None
-            
-            # Add frame counter and info
-            self.webcam1_frames += 1
-            cv2.putText(webcam_frame, f"WEBCAM 1 - Frame {self.webcam1_frames}", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            cv2.putText(webcam_frame, f"Resolution: {webcam_frame.shape[1]}x{webcam_frame.shape[0]}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            cv2.putText(webcam_frame, f"Axis 2 - Secondary View [REQUIRED]", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            
-            return webcam_frame
-            
-        except Exception as e:
-            print(f"Webcam 1 capture error: {e}")
-            return None
+        ret, webcam_frame = stream.retrieve()
+        return webcam_frame if ret else None
     
-    def capture_webcam2_frame(self):
-        """Capture and process webcam 2 frame for display"""
-        if not self.webcam2_active or not self.webcam2_stream:
-            return None
+    def _read_webcam1(self):
+        """Read one webcam 1 frame (producer side)"""
+        return self._read_webcam(self.webcam1_stream, self._webcam1_slot)
+    
+    def _read_webcam2(self):
+        """Read one webcam 2 frame (producer side)"""
+        return self._read_webcam(self.webcam2_stream, self._webcam2_slot)
+    
+    def _blit_static_overlay(self, frame, axis_label, resolution_color, axis_color):
+        """Copy the cached resolution/axis label pixels onto frame's top band"""
+        key = (axis_label, resolution_color, axis_color, frame.shape[:2])
+        cached = self._static_overlays.get(key)
+        if cached is None:
+            # Rasterize the two static lines once per camera and resolution
+            overlay = np.zeros((self.overlay_band_height, frame.shape[1], 3), dtype=np.uint8)
+            cv2.putText(overlay, f"Resolution: {frame.shape[1]}x{frame.shape[0]}",
+                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, resolution_color, 1)
+            cv2.putText(overlay, axis_label,
+                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, axis_color, 1)
+            cached = (overlay, overlay.any(axis=2, keepdims=True))
+            self._static_overlays[key] = cached
         
+        overlay, mask = cached
+        band = min(self.overlay_band_height, frame.shape[0])
+        np.copyto(frame[:band], overlay[:band], where=mask[:band])
+    
+    def _is_stale(self, captured_ns):
+        """True if a frame is older than stale_after_ns (two 30 FPS intervals)"""
+        return time.monotonic_ns() - captured_ns > self.stale_after_ns
+    
+    def _draw_stale_label(self, frame):
+        """Mark a frame that sat in its slot too long; it isn't counted as fresh"""
+        cv2.putText(frame, "[STALE]", (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+    
+    def _annotate(self, frame, cam, stale):
+        """Draw the frame counter, cached static labels and any stale marker"""
+        cv2.putText(frame, cam.prefix + str(cam.frames), 
+                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, cam.text_color, 2)
+        self._blit_static_overlay(frame, cam.axis_label, cam.resolution_color, cam.axis_color)
+        if stale:
+            self._draw_stale_label(frame)
+    
+    def capture_frame(self, cam):
+        """Take the latest frame for one camera and annotate it for display"""
         try:
-            # Get webcam frame
-            ret, webcam_frame = self.webcam2_stream.read()
-            if not ret or webcam_frame is None:
+            frame, _, captured_ns = cam.slot.snapshot()
+            if frame is None:
                 return None
             
-            # Add frame counter and info
-            self.webcam2_frames += 1
-            cv2.putText(webcam_frame, f"WEBCAM 2 - Frame {self.webcam2_frames}", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
-            cv2.putText(webcam_frame, f"Resolution: {webcam_frame.shape[1]}x{webcam_frame.shape[0]}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 1)
-            cv2.putText(webcam_frame, f"Axis 3 - Additional View [OPTIONAL]", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 1)
+            stale = self._is_stale(captured_ns)
+            if stale:
+                cam.stale_frames += 1
+            else:
+                cam.frames += 1
+            # Annotate the display buffer, in display (BGR) channel order
+            if cam.to_display is not None:
+                frame = cam.to_display(frame)
+            self._annotate(frame, cam, stale)
             
-            return webcam_frame
+            return frame
             
         except Exception as e:
-            print(f"Webcam 2 capture error: {e}")
+            print(f"{cam.report_name} capture error: {e}")
             return None
     
+    def _mosaic_quadrants(self):
+        """(row, col) origin of each camera's tile in the 2x2 mosaic"""
+        h, w = self.tile_size[1], self.tile_size[0]
+        return [(0, 0), (0, w), (h, 0), (h, w)]
+    
+    def _place_in_mosaic(self, frame, origin):
+        """Copy (resizing if needed) a camera frame into its mosaic tile"""
+        w, h = self.tile_size
+        tile = self._mosaic[origin[0]:origin[0] + h, origin[1]:origin[1] + w]
+        fh, fw = frame.shape[:2]
+        if fh <= h and fw <= w:
+            # Fits (e.g. 640x360 webcam): plain copy, the rest of the tile stays black
+            tile[:fh, :fw] = frame
+        else:
+            if self.use_opencl:
+                # T-API resize on the OpenCL device, downloaded straight into the tile
+                tile[...] = cv2.resize(cv2.UMat(frame), (w, h), interpolation=cv2.INTER_AREA).get()
+            else:
+                tile[...] = cv2.resize(frame, (w, h), interpolation=cv2.INTER_AREA)
+    
     def display_all_cameras(self):
-        """Display all 4 camera outputs in separate windows"""
+        """Display all 4 camera outputs as one 2x2 mosaic window"""
         print("\n📺 STARTING 4-CAMERA VISUAL PROOF DISPLAY...")
-        print("   Press 'q' in any window to quit")
-        print("   Each camera will show in a separate window")
+        print("   Press 'q' in the window to quit")
+        print("   Cameras are tiled: Kinect Depth | Kinect RGB / Webcam 1 | Webcam 2")
         
         self.running = True
+        next_frame_time = time.monotonic()
+        
+        # Producers kept running during the start prompt; drop what they
+        # held so the first tiles are live frames, not pre-prompt ones
+        for cam in self._cams:
+            cam.slot.discard()
+        
+        # Tiles keep their last frame; cameras that never came up show NO SIGNAL
+        self._mosaic.fill(0)
+        for origin, cam in zip(self._mosaic_quadrants(), self._cams):
+            if not cam.active:
+                cv2.putText(self._mosaic, "NO SIGNAL", (origin[1] + self.tile_size[0] // 2 - 90, origin[0] + self.tile_size[1] // 2),
+                           cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 2)
         
+        iteration = 0
         while self.running:
-            # Capture frames from all cameras
-            depth_frame = self.capture_kinect_depth_frame()
-            rgb_frame = self.capture_kinect_rgb_frame()
-            webcam1_frame = self.capture_webcam1_frame()
-            webcam2_frame = self.capture_webcam2_frame()
-            
-            # Display each camera in separate window
-            if depth_frame is not None:
-                cv2.imshow("PROOF: Kinect Depth Sensor (Axis 1) [REQUIRED]", depth_frame)
-            
-            if rgb_frame is not None:
-                cv2.imshow("PROOF: Kinect RGB Camera (Axis 1) [REQUIRED]", rgb_frame)
+            # Snapshot + annotate the newest frame from each due camera in parallel
+            # (putText/copyto release the GIL). Decimated cameras (Kinect RGB only
+            # has to prove it works) keep their last frame up in between.
+            futures = [self._annotate_pool.submit(self.capture_frame, cam)
+                       if cam.active and iteration % cam.decimate == 0 else None
+                       for cam in self._cams]
+            frames = [future.result() if future is not None else None for future in futures]
+            iteration += 1
             
-            if webcam1_frame is not None:
-                cv2.imshow("PROOF: Webcam 1 (Axis 2) [REQUIRED]", webcam1_frame)
+            # One window / one imshow for all cameras
+            for frame, origin in zip(frames, self._mosaic_quadrants()):
+                if frame is not None:
+                    self._place_in_mosaic(frame, origin)
+            cv2.imshow("PROOF: 4-Camera System", self._mosaic)
             
-            if webcam2_frame is not None:
-                cv2.imshow("PROOF: Webcam 2 (Axis 3) [OPTIONAL]", webcam2_frame)
+            # Pump the GUI until the next frame deadline (~30 FPS) instead of sleeping
+            next_frame_time += self.frame_interval
+            wait_ms = max(1, int((next_frame_time - time.monotonic()) * 1000))
+            if wait_ms == 1:
+                next_frame_time = time.monotonic()  # Running behind; don't try to catch up
             
             # Check for quit key
-            key = cv2.waitKey(1) & 0xFF
+            key = cv2.waitKey(wait_ms) & 0xFF
             if key == ord('q'):
                 print("\n🛑 User requested quit")
                 break
-            
-            # Small delay to prevent overwhelming the system
-            time.sleep(0.033)  # ~30 FPS
         
         # Close all windows
         cv2.destroyAllWindows()
@@ -277,17 +475,10 @@ class VisualProof4Cameras:
         print("="*60)
         
         print(f"🎯 CAMERA STATUS:")
-        print(f"   Kinect Depth Sensor: {'✅ PROVEN' if self.kinect_depth_frames > 0 else '❌ NO FRAMES'} ({self.kinect_depth_frames} frames)")
-        print(f"   Kinect RGB Camera: {'✅ PROVEN' if self.kinect_rgb_frames > 0 else '❌ NO FRAMES'} ({self.kinect_rgb_frames} frames)")
-        print(f"   Webcam 1: {'✅ PROVEN' if self.webcam1_frames > 0 else '❌ NO FRAMES'} ({self.webcam1_frames} frames)")
-        print(f"   Webcam 2: {'✅ PROVEN' if self.webcam2_frames > 0 else '❌ NO FRAMES'} ({self.webcam2_frames} frames)")
-        
-        working_cameras = sum([
-            self.kinect_depth_frames > 0,
-            self.kinect_rgb_frames > 0, 
-            self.webcam1_frames > 0,
-            self.webcam2_frames > 0
-        ])
+        for cam in self._cams:
+            print(f"   {cam.report_name}: {'✅ PROVEN' if cam.frames > 0 else '❌ NO FRAMES'} ({cam.frames} fresh, {cam.stale_frames} stale)")
+        
+        working_cameras = sum(cam.frames > 0 for cam in self._cams)
         
         print(f"\n🎉 PROOF SUMMARY:")
         print(f"   Working cameras: {working_cameras}/4")
@@ -315,12 +506,13 @@ class VisualProof4Cameras:
             return False
         
         print(f"\n🎬 READY TO SHOW VISUAL PROOF!")
-        print(f"   This will open up to 4 separate windows:")
+        print(f"   This will open one window tiling up to 4 cameras:")
         print(f"   1. Kinect Depth Sensor (colorized depth data)")
         print(f"   2. Kinect RGB Camera (color video)")
         print(f"   3. Webcam 1 (color video from different angle)")
         print(f"   4. Webcam 2 (additional color video - if available)")
         
+        # Capture threads keep draining the cameras while we wait here
         input("\nPress ENTER to start visual proof display...")
         
         try:
@@ -345,6 +537,21 @@ class VisualProof4Cameras:
         
         self.running = False
         
+        # Stop producers before releasing the devices they read from
+        self._capture_stop.set()
+        for thread in self._capture_threads:
+            thread.join(timeout=1.0)
+        self._capture_threads = []
+        self._annotate_pool.shutdown(wait=True)
+        
+        if self.kinect_stream is not None:
+            for listeners, callback in ((self.kinect_stream.depth_listeners, self._on_kinect_depth),
+                                        (self.kinect_stream.rgb_listeners, self._on_kinect_rgb)):
+                if callback in listeners:
+                    listeners.remove(callback)
+            self.kinect_stream.stop()
+            self.kinect_stream = None
+        
         if self.webcam1_stream:
             try:
                 self.webcam1_stream.release()
@@ -11,12 +11,169 @@ import json
 import os
 from scipy.interpolate import griddata
 
+from depth_colormap import build_depth_lut
+
 try:
     import freenect
+    from kinect_stream import ensure_kinect_started
     KINECT_AVAILABLE = True
 except ImportError:
     KINECT_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    print("✅ Numba JIT available")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("⚠️ Numba not available - using NumPy voxel path")
+
+try:
+    import cupy as cp
+    cp.cuda.runtime.getDeviceCount()  # Raises without a usable CUDA driver/device
+    CUPY_AVAILABLE = True
+    print("✅ CuPy GPU voxelization available")
+except Exception:
+    CUPY_AVAILABLE = False
+    print("⚠️ CuPy/CUDA not available - using CPU voxel path")
+
+# One CUDA thread per depth pixel: deproject and mark its voxel. Every writer
+# to a voxel stores 1, so the grid needs no atomics; colour is last-writer-wins.
+# The top-down height map (top z + 1 per column) is kept with atomicMax.
+_VOXEL_FILL_KERNEL_SRC = r"""
+extern "C" __global__
+void voxel_fill(const unsigned short* depth, const unsigned char* rgb,
+                const float* x_n, const float* y_n, int n_pixels,
+                float min_x, float min_y, float min_z, float voxel_size,
+                int sx, int sy, int sz, int has_rgb,
+                unsigned char* grid, unsigned char* colors, int* top_view)
+{
+    int i = blockDim.x * blockIdx.x + threadIdx.x;
+    if (i >= n_pixels) return;
+    float z = depth[i] * 1e-3f;
+    if (z <= 0.1f || z >= 5.0f) return;
+    int ix = (int)((x_n[i] * z - min_x) / voxel_size);
+    int iy = (int)((y_n[i] * z - min_y) / voxel_size);
+    int iz = (int)((z - min_z) / voxel_size);
+    if (ix < 0 || iy < 0 || iz < 0 || ix >= sx || iy >= sy || iz >= sz) return;
+    int idx = (ix * sy + iy) * sz + iz;
+    grid[idx] = 1;
+    atomicMax(&top_view[ix * sy + iy], iz + 1);
+    if (has_rgb) {
+        colors[3 * idx] = rgb[3 * i];
+        colors[3 * idx + 1] = rgb[3 * i + 1];
+        colors[3 * idx + 2] = rgb[3 * i + 2];
+    }
+}
+"""
+
+# Kinect v1 depth is always 640x480 with fx = fy = 525; the specialized Numba
+# kernels fold these into compile-time constants instead of reading ray arrays
+_KINECT_W, _KINECT_H = 640, 480
+_KINECT_CX, _KINECT_CY = 320.0, 240.0
+_KINECT_INV_F = 1.0 / 525.0
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _depth_bounds(depth, x_n, y_n, row_min, row_max):
+        """Per-row min/max of the valid deprojected points, one row per thread"""
+        h, w = depth.shape
+        for v in prange(h):
+            lo_x = lo_y = lo_z = np.inf
+            hi_x = hi_y = hi_z = -np.inf
+            for u in range(w):
+                z = depth[v, u] * np.float32(1e-3)
+                if z <= 0.1 or z >= 5.0:
+                    continue
+                x = x_n[v, u] * z
+                y = y_n[v, u] * z
+                lo_x = min(lo_x, x)
+                lo_y = min(lo_y, y)
+                lo_z = min(lo_z, z)
+                hi_x = max(hi_x, x)
+                hi_y = max(hi_y, y)
+                hi_z = max(hi_z, z)
+            row_min[v, 0] = lo_x
+            row_min[v, 1] = lo_y
+            row_min[v, 2] = lo_z
+            row_max[v, 0] = hi_x
+            row_max[v, 1] = hi_y
+            row_max[v, 2] = hi_z
+    
+    @njit(parallel=True, cache=True)
+    def _fill_voxel_grid(depth, rgb, x_n, y_n, min_bounds, voxel_size, grid, colors, has_rgb):
+        """Deproject each valid pixel and mark its voxel, without a points array"""
+        h, w = depth.shape
+        sx, sy, sz = grid.shape
+        for v in prange(h):
+            for u in range(w):
+                z = depth[v, u] * np.float32(1e-3)
+                if z <= 0.1 or z >= 5.0:
+                    continue
+                ix = int((x_n[v, u] * z - min_bounds[0]) / voxel_size)
+                iy = int((y_n[v, u] * z - min_bounds[1]) / voxel_size)
+                iz = int((z - min_bounds[2]) / voxel_size)
+                if ix < 0 or iy < 0 or iz < 0 or ix >= sx or iy >= sy or iz >= sz:
+                    continue
+                grid[ix, iy, iz] = 1
+                if has_rgb:
+                    colors[ix, iy, iz, 0] = rgb[v, u, 0]
+                    colors[ix, iy, iz, 1] = rgb[v, u, 1]
+                    colors[ix, iy, iz, 2] = rgb[v, u, 2]
+    
+    @njit(parallel=True, cache=True)
+    def _depth_bounds_640x480(depth, stride, row_min, row_max):
+        """_depth_bounds for a full-resolution Kinect frame, sampling every stride-th pixel"""
+        for i in prange((_KINECT_H + stride - 1) // stride):
+            v = i * stride
+            lo_x = lo_y = lo_z = np.inf
+            hi_x = hi_y = hi_z = -np.inf
+            for u in range(0, _KINECT_W, stride):
+                z = depth[v, u] * np.float32(1e-3)
+                if z <= 0.1 or z >= 5.0:
+                    continue
+                x = (u - _KINECT_CX) * _KINECT_INV_F * z
+                y = (v - _KINECT_CY) * _KINECT_INV_F * z
+                lo_x = min(lo_x, x)
+                lo_y = min(lo_y, y)
+                lo_z = min(lo_z, z)
+                hi_x = max(hi_x, x)
+                hi_y = max(hi_y, y)
+                hi_z = max(hi_z, z)
+            row_min[i, 0] = lo_x
+            row_min[i, 1] = lo_y
+            row_min[i, 2] = lo_z
+            row_max[i, 0] = hi_x
+            row_max[i, 1] = hi_y
+            row_max[i, 2] = hi_z
+    
+    @njit(parallel=True, cache=True)
+    def _fill_voxel_grid_640x480(depth, rgb, stride, min_bounds, voxel_size, grid, colors, has_rgb):
+        """_fill_voxel_grid for a full-resolution Kinect frame, sampling every stride-th pixel"""
+        sx, sy, sz = grid.shape
+        for i in prange((_KINECT_H + stride - 1) // stride):
+            v = i * stride
+            for u in range(0, _KINECT_W, stride):
+                z = depth[v, u] * np.float32(1e-3)
+                if z <= 0.1 or z >= 5.0:
+                    continue
+                ix = int(((u - _KINECT_CX) * _KINECT_INV_F * z - min_bounds[0]) / voxel_size)
+                iy = int(((v - _KINECT_CY) * _KINECT_INV_F * z - min_bounds[1]) / voxel_size)
+                iz = int((z - min_bounds[2]) / voxel_size)
+                if ix < 0 or iy < 0 or iz < 0 or ix >= sx or iy >= sy or iz >= sz:
+                    continue
+                grid[ix, iy, iz] = 1
+                if has_rgb:
+                    colors[ix, iy, iz, 0] = rgb[v, u, 0]
+                    colors[ix, iy, iz, 1] = rgb[v, u, 1]
+                    colors[ix, iy, iz, 2] = rgb[v, u, 2]
+
 class VoxelSystemIntegration:
     """
     Integration between 3D extrapolation and Divine Voxel Engine
@@ -25,15 +182,27 @@ class VoxelSystemIntegration:
     def __init__(self):
         # Voxel settings
         self.voxel_size = 0.01  # 1cm voxels
+        self.max_grid_size = 200  # Cap per grid axis; also sets the depth sampling stride
         self.voxel_grid = None
         self.voxel_data = None
         
         # 3D data
+        self.kinect_stream = None
         self.kinect_depth = None
         self.kinect_rgb = None
+        self._depth_timestamp = None
+        self._depth_seq = 0
         self.topography_grid = None
         self.point_cloud = None
         
+        # Normalized pixel ray directions per depth shape
+        self._ray_cache = {}
+        self._rgb_buf = None
+        
+        # GPU voxelization state (ray directions uploaded once per shape)
+        self._gpu_ray_cache = {}
+        self._voxel_fill_kernel = cp.RawKernel(_VOXEL_FILL_KERNEL_SRC, 'voxel_fill') if CUPY_AVAILABLE else None
+        
         # Divine Voxel Engine integration
         self.dve_path = "external_libs/divine-voxel-engine"
         self.voxel_materials = {
@@ -43,10 +212,36 @@ class VoxelSystemIntegration:
             'stone': {'id': 'dve_stone', 'color': [128, 128, 128]},
             'grass': {'id': 'dve_grass', 'color': [34, 139, 34]}
         }
+        # BGR display colour per material id (0 = empty, 1 sand, 2 water, 3 dirt, 4 stone, 5 grass)
+        self._material_palette = np.array(
+            [[0, 0, 0]] + [self.voxel_materials[name]['color'][::-1]
+                           for name in ('sand', 'water', 'dirt', 'stone', 'grass')],
+            dtype=np.uint8)
+        
+        # Classification/export only run on save; the live material
+        # preview is refreshed every Nth frame
+        self.material_preview_interval = 10
+        self._material_preview = None
+        
+        # Depth display: fixed Kinect range (mm) folded with JET into one
+        # raw depth -> BGR lookup, so there's no per-frame MINMAX scan
+        self.depth_min_mm = 500
+        self.depth_max_mm = 4500
+        self._depth_bgr_lut = build_depth_lut(self.depth_min_mm, self.depth_max_mm)
+        self._depth_colored = None
         
         # Performance tracking
         self.frame_count = 0
         self.start_time = time.time()
+        
+        # Status window: static text rendered once, dynamic lines stamped per frame
+        self._status_template = np.zeros((400, 600, 3), dtype=np.uint8)
+        cv2.putText(self._status_template, "VOXEL SYSTEM INTEGRATION", 
+                   (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+        cv2.putText(self._status_template, "Divine Voxel Engine Integration", 
+                   (20, 210), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        cv2.putText(self._status_template, "Press 'q' to exit, 's' to save", 
+                   (20, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
     
     def initialize_kinect(self):
         """Initialize Kinect for voxel data capture"""
@@ -54,18 +249,16 @@ class VoxelSystemIntegration:
             return False
         
         try:
-            # Reset and initialize
-            freenect.stop_depth(0)
-            freenect.stop_video(0)
-            time.sleep(1.0)
-            
-            freenect.set_depth_mode(0, freenect.DEPTH_11BIT)
-            freenect.set_video_mode(0, freenect.VIDEO_RGB)
-            
-            freenect.start_depth(0)
-            time.sleep(0.5)
-            freenect.start_video(0)
-            time.sleep(0.5)
+            # Async freenect stream: depth/RGB callbacks on a background thread
+            # while this thread voxelizes the previous frame
+            self.kinect_stream = ensure_kinect_started()
+            # With the Numba/CuPy kernels depth is voxelized and coloured well within
+            # two frame intervals, so a ring of three reused buffers replaces a new
+            # array per frame; the NumPy fallback is too slow and keeps per-frame copies
+            self.kinect_stream.use_depth_buffers(3 if NUMBA_AVAILABLE or CUPY_AVAILABLE else 0)
+            if self.kinect_stream.latest_depth(timeout=2.0) is None:
+                print("❌ Kinect init failed: no depth frames")
+                return False
             
             print("✅ Kinect initialized for voxel capture")
             return True
@@ -79,188 +272,329 @@ class VoxelSystemIntegration:
         if not KINECT_AVAILABLE:
             return False
         
+        if self.kinect_stream is None:
+            return False
+        
         try:
-            self.kinect_depth, _ = freenect.sync_get_depth()
-            self.kinect_rgb, _ = freenect.sync_get_video()
+            # Swap in the latest frame references; no copy, no device round-trip
+            frame = self.kinect_stream.latest_frame()
+            if frame is None or frame.depth is None or frame.depth_timestamp == self._depth_timestamp:
+                return False  # No new depth since the last call
             
-            return self.kinect_depth is not None
+            self.kinect_depth = frame.depth
+            self.kinect_rgb = frame.rgb
+            self._depth_timestamp = frame.depth_timestamp
+            self._depth_seq = frame.depth_seq  # Published with the buffer it describes
+            return True
             
         except Exception as e:
             return False
     
-    def depth_to_point_cloud(self, depth_data):
-        """Convert depth data to 3D point cloud"""
+    def _pixel_rays(self, h, w, stride=1):
+        """Normalized ray directions (x/z, y/z) per sampled pixel, cached per frame shape and stride"""
+        rays = self._ray_cache.get((h, w, stride))
+        if rays is None:
+            if stride > 1:
+                # Every stride-th full-resolution ray: same as scaling fx, fy, cx, cy by 1/stride
+                rays = tuple(np.ascontiguousarray(r[::stride, ::stride]) for r in self._pixel_rays(h, w))
+            else:
+                # Camera intrinsics
+                fx, fy = 525.0, 525.0
+                cx, cy = w/2, h/2
+                
+                u, v = np.meshgrid(np.arange(w, dtype=np.float32), np.arange(h, dtype=np.float32))
+                rays = (((u - cx) / fx).astype(np.float32), ((v - cy) / fy).astype(np.float32))
+            self._ray_cache[(h, w, stride)] = rays
+        return rays
+    
+    def _rgb_for_depth(self, h, w, stride=1):
+        """Kinect RGB at the sampled depth pixels; resized into a reused buffer only if needed"""
+        if self.kinect_rgb.shape[:2] == (h, w):
+            rgb = self.kinect_rgb
+        else:
+            if self._rgb_buf is None or self._rgb_buf.shape[:2] != (h, w):
+                self._rgb_buf = np.empty((h, w, 3), dtype=np.uint8)
+            rgb = cv2.resize(self.kinect_rgb, (w, h), dst=self._rgb_buf, interpolation=cv2.INTER_NEAREST)
+        return rgb[::stride, ::stride]
+    
+    def _depth_stride(self, h, w):
+        """Depth sampling stride: about one sample per voxel across the shorter image axis"""
+        return max(1, min(h, w) // self.max_grid_size)
+    
+    def depth_to_point_cloud(self, depth_data, stride=1):
+        """Convert depth data (every stride-th pixel) to 3D point cloud"""
         if depth_data is None:
             return None
         
         h, w = depth_data.shape
+        x_n, y_n = self._pixel_rays(h, w, stride)
+        depth_data = depth_data[::stride, ::stride]
         
-        # Camera intrinsics
-        fx, fy = 525.0, 525.0
-        cx, cy = w/2, h/2
-        
-        # Create coordinate grids
-        u, v = np.meshgrid(np.arange(w), np.arange(h))
-        
-        # Convert to 3D
-        z = depth_data.astype(np.float32) / 1000.0  # Convert mm to m
-        x = (u - cx) * z / fx
-        y = (v - cy) * z / fy
-        
-        # Filter valid points
-        valid_mask = (z > 0.1) & (z < 5.0)
+        # Filter valid points on the raw millimetre values (0.1 m < z < 5 m),
+        # so only valid pixels are ever converted to float
+        valid_mask = (depth_data > 100) & (depth_data < 5000)
         
-        if np.sum(valid_mask) == 0:
+        if not valid_mask.any():
             return None
         
-        points = np.stack([x[valid_mask], y[valid_mask], z[valid_mask]], axis=1)
+        # Convert to 3D
+        z = depth_data[valid_mask].astype(np.float32) * np.float32(1e-3)  # mm to m
+        points = np.empty((z.size, 3), dtype=np.float32)
+        np.multiply(x_n[valid_mask], z, out=points[:, 0])
+        np.multiply(y_n[valid_mask], z, out=points[:, 1])
+        points[:, 2] = z
         
         # Add colors if RGB available
         colors = None
         if self.kinect_rgb is not None:
-            rgb_resized = cv2.resize(self.kinect_rgb, (w, h))
-            colors = rgb_resized[valid_mask] / 255.0
+            rgb_resized = self._rgb_for_depth(h, w, stride)
+            colors = rgb_resized[valid_mask].astype(np.float32) * np.float32(1.0 / 255.0)
         
         return {'points': points, 'colors': colors}
     
-    def create_voxel_grid(self, point_cloud):
-        """Create voxel grid from point cloud"""
-        if point_cloud is None or point_cloud['points'] is None:
-            return None
-        
-        points = point_cloud['points']
-        colors = point_cloud['colors']
-        
-        # Calculate bounds
-        min_bounds = np.min(points, axis=0)
-        max_bounds = np.max(points, axis=0)
-        
-        # Create voxel grid dimensions
+    def _grid_dimensions(self, min_bounds, max_bounds):
+        """Voxel grid dimensions for the given bounds, capped for performance"""
         grid_size = ((max_bounds - min_bounds) / self.voxel_size).astype(int) + 1
         
         # Limit grid size for performance
-        max_size = 200
-        if np.any(grid_size > max_size):
-            scale_factor = max_size / np.max(grid_size)
+        if np.any(grid_size > self.max_grid_size):
+            scale_factor = self.max_grid_size / np.max(grid_size)
             grid_size = (grid_size * scale_factor).astype(int)
             self.voxel_size = self.voxel_size / scale_factor
         
-        # Initialize voxel grid
+        return grid_size
+    
+    def voxelize_depth(self, depth_data):
+        """Depth frame straight to voxel data (CUDA or fused Numba kernels when available)"""
+        if depth_data is None:
+            return None
+        
+        # Sample depth at source so the point set already matches the grid resolution
+        h, w = depth_data.shape
+        stride = self._depth_stride(h, w)
+        
+        if CUPY_AVAILABLE:
+            return self._voxelize_depth_gpu(depth_data, stride)
+        if not NUMBA_AVAILABLE:
+            self.point_cloud = self.depth_to_point_cloud(depth_data, stride)
+            return self.create_voxel_grid(self.point_cloud)
+        
+        # Native Kinect frames use the kernels with the intrinsics baked in
+        kinect_native = (h, w) == (_KINECT_H, _KINECT_W)
+        if not kinect_native:
+            x_n, y_n = self._pixel_rays(h, w, stride)
+        
+        # Pass 1: bounds of the valid points, reduced per row in parallel
+        rows = (h + stride - 1) // stride
+        row_min = np.empty((rows, 3), dtype=np.float32)
+        row_max = np.empty((rows, 3), dtype=np.float32)
+        if kinect_native:
+            _depth_bounds_640x480(depth_data, stride, row_min, row_max)
+        else:
+            _depth_bounds(depth_data[::stride, ::stride], x_n, y_n, row_min, row_max)
+        min_bounds = row_min.min(axis=0)
+        max_bounds = row_max.max(axis=0)
+        if not np.all(np.isfinite(min_bounds)):
+            return None  # No valid depth
+        
+        grid_size = self._grid_dimensions(min_bounds, max_bounds)
         voxel_grid = np.zeros(grid_size, dtype=np.uint8)
         voxel_colors = np.zeros((*grid_size, 3), dtype=np.uint8)
         
-        # Fill voxel grid
-        for i, point in enumerate(points):
-            # Convert point to voxel coordinates
-            voxel_coord = ((point - min_bounds) / self.voxel_size).astype(int)
-            
-            # Ensure within bounds
-            if np.all(voxel_coord >= 0) and np.all(voxel_coord < grid_size):
-                voxel_grid[tuple(voxel_coord)] = 1
-                
-                if colors is not None:
-                    voxel_colors[tuple(voxel_coord)] = (colors[i] * 255).astype(np.uint8)
+        # Pass 2: deproject and scatter in one sweep over the depth frame
+        has_rgb = self.kinect_rgb is not None
+        voxel_size = np.float32(self.voxel_size)
+        if kinect_native:
+            rgb = self._rgb_for_depth(h, w) if has_rgb else np.zeros((1, 1, 3), dtype=np.uint8)
+            _fill_voxel_grid_640x480(depth_data, rgb, stride, min_bounds, voxel_size,
+                                     voxel_grid, voxel_colors, has_rgb)
+        else:
+            rgb = self._rgb_for_depth(h, w, stride) if has_rgb else np.zeros((1, 1, 3), dtype=np.uint8)
+            _fill_voxel_grid(depth_data[::stride, ::stride], rgb, x_n, y_n, min_bounds, voxel_size,
+                             voxel_grid, voxel_colors, has_rgb)
+        
+        # Keep only the occupied voxels
+        flat_idx = np.flatnonzero(voxel_grid)
+        return self._sparse_voxel_data(flat_idx, voxel_colors.reshape(-1, 3)[flat_idx],
+                                       min_bounds, max_bounds, grid_size)
+    
+    def _voxelize_depth_gpu(self, depth_data, stride=1):
+        """voxelize_depth on the GPU: one CUDA thread per sampled pixel, occupied voxels downloaded once"""
+        h, w = depth_data.shape
+        rays = self._gpu_ray_cache.get((h, w, stride))
+        if rays is None:
+            rays = tuple(cp.asarray(r) for r in self._pixel_rays(h, w, stride))
+            self._gpu_ray_cache[(h, w, stride)] = rays
+        x_n, y_n = rays
+        
+        # Bounds of the valid points, reduced on the device
+        depth_gpu = cp.asarray(np.ascontiguousarray(depth_data[::stride, ::stride]), dtype=cp.uint16)
+        z = depth_gpu * cp.float32(1e-3)
+        valid = (z > 0.1) & (z < 5.0)
+        if not bool(valid.any()):
+            return None
+        x, y, z = x_n[valid] * z[valid], y_n[valid] * z[valid], z[valid]
+        bounds = cp.stack([x.min(), y.min(), z.min(), x.max(), y.max(), z.max()]).get()
+        min_bounds, max_bounds = bounds[:3], bounds[3:]
+        
+        grid_size = self._grid_dimensions(min_bounds, max_bounds)
+        sx, sy, sz = (int(n) for n in grid_size)
+        grid_gpu = cp.zeros(sx * sy * sz, dtype=cp.uint8)
+        colors_gpu = cp.zeros(sx * sy * sz * 3, dtype=cp.uint8)
+        top_view_gpu = cp.zeros(sx * sy, dtype=cp.int32)
+        
+        has_rgb = self.kinect_rgb is not None
+        rgb_gpu = (cp.asarray(np.ascontiguousarray(self._rgb_for_depth(h, w, stride))) if has_rgb
+                   else cp.zeros(3, dtype=cp.uint8))
+        
+        n_pixels = depth_gpu.size
+        threads = 256
+        self._voxel_fill_kernel(
+            ((n_pixels + threads - 1) // threads,), (threads,),
+            (depth_gpu, rgb_gpu, x_n, y_n, np.int32(n_pixels),
+             np.float32(min_bounds[0]), np.float32(min_bounds[1]), np.float32(min_bounds[2]),
+             np.float32(self.voxel_size), np.int32(sx), np.int32(sy), np.int32(sz),
+             np.int32(has_rgb), grid_gpu, colors_gpu, top_view_gpu))
+        
+        # Compact on the device; only the occupied voxels are downloaded
+        flat_idx = cp.flatnonzero(grid_gpu)
+        colors = colors_gpu.reshape(-1, 3)[flat_idx].get()
+        top_view = top_view_gpu.get().reshape(sx, sy).astype(np.int16)
+        return self._sparse_voxel_data(flat_idx.get(), colors, min_bounds, max_bounds, grid_size, top_view)
+    
+    def _sparse_voxel_data(self, flat_idx, colors, min_bounds, max_bounds, grid_size, top_view=None):
+        """voxel_data dict holding only occupied voxels: (N, 3) positions and colours"""
+        positions = np.stack(np.unravel_index(flat_idx, tuple(grid_size)), axis=1).astype(np.int16)
+        
+        # Top-down height map (top z + 1 per column, 0 where empty), built with
+        # the voxels so display and classification just read it
+        if top_view is None:
+            top_view = np.zeros(tuple(grid_size[:2]), dtype=np.int16)
+            np.maximum.at(top_view, (positions[:, 0], positions[:, 1]), positions[:, 2] + 1)
         
         return {
-            'grid': voxel_grid,
-            'colors': voxel_colors,
+            'positions': positions,
+            'colors': colors,
+            'top_view': top_view,
+            'voxel_count': len(positions),
             'size': self.voxel_size,
             'bounds': [min_bounds, max_bounds],
             'dimensions': grid_size
         }
     
+    def create_voxel_grid(self, point_cloud):
+        """Create voxel grid from point cloud"""
+        if point_cloud is None or point_cloud['points'] is None:
+            return None
+        
+        points = point_cloud['points']
+        colors = point_cloud['colors']
+        
+        # Calculate bounds
+        min_bounds = np.min(points, axis=0)
+        max_bounds = np.max(points, axis=0)
+        grid_size = self._grid_dimensions(min_bounds, max_bounds)
+        
+        # Voxel coordinates for all points at once, as flat indices
+        coords = ((points - min_bounds) / self.voxel_size).astype(np.int32)
+        in_bounds = np.all((coords >= 0) & (coords < grid_size), axis=1)
+        c = coords[in_bounds]
+        lin = np.ravel_multi_index((c[:, 0], c[:, 1], c[:, 2]), tuple(grid_size))
+        
+        # One entry per occupied voxel; searching the reversed list keeps the
+        # last point written to a voxel, as before
+        flat_idx, last = np.unique(lin[::-1], return_index=True)
+        if colors is not None:
+            voxel_colors = (colors[in_bounds][::-1][last] * 255).astype(np.uint8)
+        else:
+            voxel_colors = np.zeros((len(flat_idx), 3), dtype=np.uint8)
+        
+        return self._sparse_voxel_data(flat_idx, voxel_colors, min_bounds, max_bounds, grid_size)
+    
     def classify_voxel_materials(self, voxel_data):
-        """Classify voxels into material types"""
+        """Classify voxels into material types, one id per occupied voxel (memoized on voxel_data)"""
         if voxel_data is None:
             return None
+        if 'materials' in voxel_data:
+            return voxel_data['materials']
         
-        grid = voxel_data['grid']
+        positions = voxel_data['positions']
         colors = voxel_data['colors']
         
-        # Material classification based on height and color
-        material_grid = np.zeros_like(grid, dtype=np.uint8)
-        
-        # Get height information
-        height_map = np.zeros(grid.shape[:2])
-        for x in range(grid.shape[0]):
-            for y in range(grid.shape[1]):
-                z_indices = np.where(grid[x, y, :] > 0)[0]
-                if len(z_indices) > 0:
-                    height_map[x, y] = np.max(z_indices)
+        # Get height information: top occupied z index per (x, y) column
+        height_map = voxel_data['top_view'].astype(np.float32) - 1
         
         # Normalize height
-        if np.max(height_map) > 0:
-            height_norm = height_map / np.max(height_map)
+        max_height = height_map.max()
+        if max_height > 0:
+            height_norm = height_map / max_height
         else:
-            height_norm = height_map
-        
-        # Classify materials
-        for x in range(grid.shape[0]):
-            for y in range(grid.shape[1]):
-                for z in range(grid.shape[2]):
-                    if grid[x, y, z] > 0:
-                        height = height_norm[x, y]
-                        color = colors[x, y, z]
-                        
-                        # Material classification logic
-                        if height < 0.2:  # Low areas
-                            if np.mean(color) < 100:  # Dark = water
-                                material_grid[x, y, z] = 2  # Water
-                            else:
-                                material_grid[x, y, z] = 1  # Sand
-                        elif height < 0.6:  # Medium areas
-                            if color[1] > color[0] and color[1] > color[2]:  # Green
-                                material_grid[x, y, z] = 5  # Grass
-                            else:
-                                material_grid[x, y, z] = 3  # Dirt
-                        else:  # High areas
-                            material_grid[x, y, z] = 4  # Stone
-        
-        return material_grid
+            height_norm = np.zeros_like(height_map)
+        
+        height = height_norm[positions[:, 0], positions[:, 1]]
+        r, g, b = colors[:, 0], colors[:, 1], colors[:, 2]
+        
+        # Material classification based on height and color
+        materials = np.full(len(positions), 4, dtype=np.uint8)  # High areas: stone
+        
+        # Low areas: dark = water, otherwise sand (mean < 100 <=> sum < 300)
+        low = height < 0.2
+        dark = colors.sum(axis=1, dtype=np.uint16) < 300
+        materials[low & dark] = 2  # Water
+        materials[low & ~dark] = 1  # Sand
+        
+        # Medium areas: green = grass, otherwise dirt
+        medium = (height >= 0.2) & (height < 0.6)
+        green = (g > r) & (g > b)
+        materials[medium & green] = 5  # Grass
+        materials[medium & ~green] = 3  # Dirt
+        
+        # Cached on this frame's voxel_data; voxelization builds a new dict
+        voxel_data['materials'] = materials
+        return materials
+    
+    def render_material_preview(self, voxel_data, materials):
+        """Top-down view of the material of the highest voxel in each column"""
+        if voxel_data is None or materials is None:
+            return None
+        
+        # Positions are unique, so exactly one voxel per column sits on top
+        positions = voxel_data['positions']
+        top_view = voxel_data['top_view']
+        on_top = positions[:, 2] + 1 == top_view[positions[:, 0], positions[:, 1]]
+        top_material = np.zeros(top_view.shape, dtype=np.uint8)
+        top_material[positions[on_top, 0], positions[on_top, 1]] = materials[on_top]
+        
+        preview = cv2.resize(self._material_palette[top_material], (480, 360),
+                             interpolation=cv2.INTER_NEAREST)
+        cv2.putText(preview, "MATERIALS (TOP VIEW)", (10, 30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        return preview
     
-    def export_to_divine_voxel_format(self, voxel_data, material_grid):
+    def export_to_divine_voxel_format(self, voxel_data, materials):
         """Export voxel data to Divine Voxel Engine format"""
-        if voxel_data is None or material_grid is None:
+        if voxel_data is None or materials is None:
             return None
         
-        # Create DVE-compatible data structure
+        # Create DVE-compatible data structure, one array per voxel attribute
         dve_data = {
             'metadata': {
                 'version': '1.0',
                 'generator': 'AR Sandbox RC',
                 'timestamp': time.time(),
-                'voxel_size': voxel_data['size'],
+                'voxel_size': float(voxel_data['size']),
                 'dimensions': voxel_data['dimensions'].tolist(),
-                'bounds': [bound.tolist() for bound in voxel_data['bounds']]
+                'bounds': [bound.tolist() for bound in voxel_data['bounds']],
+                'voxel_count': voxel_data['voxel_count']
             },
-            'voxels': [],
-            'materials': self.voxel_materials
+            'positions': voxel_data['positions'],
+            'materials': materials,
+            'colors': voxel_data['colors'],
+            # Every voxel is solid with collision; water (2) is transparent
+            'transparent': materials == 2,
+            'material_table': self.voxel_materials
         }
         
-        # Convert voxel grid to DVE format
-        grid = voxel_data['grid']
-        colors = voxel_data['colors']
-        
-        for x in range(grid.shape[0]):
-            for y in range(grid.shape[1]):
-                for z in range(grid.shape[2]):
-                    if grid[x, y, z] > 0:
-                        material_id = material_grid[x, y, z]
-                        color = colors[x, y, z].tolist()
-                        
-                        voxel = {
-                            'position': [x, y, z],
-                            'material': material_id,
-                            'color': color,
-                            'properties': {
-                                'solid': True,
-                                'transparent': material_id == 2,  # Water is transparent
-                                'collision': True
-                            }
-                        }
-                        
-                        dve_data['voxels'].append(voxel)
-        
         return dve_data
     
     def save_voxel_data(self, dve_data, filename="ar_sandbox_voxels.json"):
@@ -269,23 +603,27 @@ class VoxelSystemIntegration:
             return False
         
         try:
-            # Save main data
-            with open(filename, 'w') as f:
-                json.dump(dve_data, f, indent=2)
-            
-            # Save binary grid data for faster loading
+            # Voxel arrays go to the compressed binary file
             binary_filename = filename.replace('.json', '.npz')
-            if 'voxels' in dve_data and len(dve_data['voxels']) > 0:
-                # Convert voxel list to arrays for faster processing
-                positions = np.array([v['position'] for v in dve_data['voxels']])
-                materials = np.array([v['material'] for v in dve_data['voxels']])
-                colors = np.array([v['color'] for v in dve_data['voxels']])
-                
-                np.savez(binary_filename,
-                        positions=positions,
-                        materials=materials,
-                        colors=colors,
-                        metadata=dve_data['metadata'])
+            np.savez_compressed(binary_filename,
+                               positions=dve_data['positions'],
+                               materials=dve_data['materials'],
+                               colors=dve_data['colors'],
+                               transparent=dve_data['transparent'],
+                               metadata=json.dumps(dve_data['metadata']))
+            
+            # JSON keeps only the header and material table
+            header = {
+                'metadata': dve_data['metadata'],
+                'materials': dve_data['material_table'],
+                'voxel_file': os.path.basename(binary_filename)
+            }
+            if ORJSON_AVAILABLE:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(header, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(header, f, indent=2)
             
             print(f"💾 Voxel data saved: {filename}")
             return True
@@ -308,34 +646,34 @@ class VoxelSystemIntegration:
             while True:
                 # Capture 3D data
                 if self.capture_3d_data():
-                    # Convert to point cloud
-                    self.point_cloud = self.depth_to_point_cloud(self.kinect_depth)
+                    # Colour the new depth frame once, into a reused buffer
+                    if self._depth_colored is None or self._depth_colored.shape[:2] != self.kinect_depth.shape:
+                        self._depth_colored = np.empty(self.kinect_depth.shape + (3,), dtype=np.uint8)
+                    np.take(self._depth_bgr_lut, self.kinect_depth, axis=0, out=self._depth_colored)
+                    cv2.putText(self._depth_colored, "KINECT DEPTH", (10, 30), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
                     
-                    # Create voxel grid
-                    if self.point_cloud is not None:
-                        self.voxel_data = self.create_voxel_grid(self.point_cloud)
+                    # Depth -> voxel grid
+                    voxel_data = self.voxelize_depth(self.kinect_depth)
+                    if not self.kinect_stream.depth_buffer_intact(self._depth_seq):
+                        # The ring recycled the buffer mid-voxelization; keep the last grid
+                        voxel_data = None
+                    if voxel_data is not None:
+                        self.voxel_data = voxel_data
                         
-                        if self.voxel_data is not None:
-                            # Classify materials
-                            material_grid = self.classify_voxel_materials(self.voxel_data)
-                            
-                            # Export to DVE format
-                            if material_grid is not None:
-                                dve_data = self.export_to_divine_voxel_format(self.voxel_data, material_grid)
+                        # Refresh the material preview every Nth frame
+                        if self.frame_count % self.material_preview_interval == 0:
+                            materials = self.classify_voxel_materials(self.voxel_data)
+                            self._material_preview = self.render_material_preview(self.voxel_data, materials)
                 
-                # Display depth
-                if self.kinect_depth is not None:
-                    depth_norm = cv2.normalize(self.kinect_depth, None, 0, 255, cv2.NORM_MINMAX)
-                    depth_colored = cv2.applyColorMap(depth_norm.astype(np.uint8), cv2.COLORMAP_JET)
-                    cv2.putText(depth_colored, "KINECT DEPTH", (10, 30), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                    cv2.imshow('Kinect Depth', depth_colored)
+                # Display depth (recoloured only when a new frame arrived)
+                if self._depth_colored is not None:
+                    cv2.imshow('Kinect Depth', self._depth_colored)
                 
                 # Display voxel visualization
                 if self.voxel_data is not None:
-                    # Create 2D projection of voxel grid
-                    grid = self.voxel_data['grid']
-                    voxel_2d = np.max(grid, axis=2)  # Top-down view
+                    # Create 2D projection of voxel grid (top-down height view)
+                    voxel_2d = self.voxel_data['top_view']
                     
                     if np.max(voxel_2d) > 0:
                         voxel_vis = cv2.normalize(voxel_2d, None, 0, 255, cv2.NORM_MINMAX)
@@ -351,16 +689,17 @@ class VoxelSystemIntegration:
                         
                         cv2.imshow('Voxel Visualization', voxel_resized)
                 
+                # Display material classification (cached preview)
+                if self._material_preview is not None:
+                    cv2.imshow('Material Classification', self._material_preview)
+                
                 # Status display
-                status_img = np.zeros((400, 600, 3), dtype=np.uint8)
+                status_img = self._status_template.copy()
                 
                 self.frame_count += 1
                 elapsed = time.time() - self.start_time
                 fps = self.frame_count / elapsed if elapsed > 0 else 0
                 
-                cv2.putText(status_img, "VOXEL SYSTEM INTEGRATION", 
-                           (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-                
                 kinect_status = "✅ ACTIVE" if self.kinect_depth is not None else "❌ INACTIVE"
                 cv2.putText(status_img, f"Kinect: {kinect_status}", 
                            (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
@@ -373,33 +712,29 @@ class VoxelSystemIntegration:
                            (20, 140), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
                 
                 if self.voxel_data:
-                    voxel_count = np.sum(self.voxel_data['grid'] > 0)
+                    voxel_count = self.voxel_data['voxel_count']
                     cv2.putText(status_img, f"Voxel Count: {voxel_count}", 
                                (20, 170), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
                 
-                cv2.putText(status_img, "Divine Voxel Engine Integration", 
-                           (20, 210), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                cv2.putText(status_img, "Press 'q' to exit, 's' to save", 
-                           (20, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                
                 cv2.imshow('Voxel Status', status_img)
                 
-                # Handle input
-                key = cv2.waitKey(1) & 0xFF
+                # Handle input; the 33 ms wait also paces the loop (~30 FPS)
+                key = cv2.waitKey(33) & 0xFF
                 if key == ord('q'):
                     break
                 elif key == ord('s'):
                     if self.voxel_data is not None:
-                        material_grid = self.classify_voxel_materials(self.voxel_data)
-                        if material_grid is not None:
-                            dve_data = self.export_to_divine_voxel_format(self.voxel_data, material_grid)
+                        materials = self.classify_voxel_materials(self.voxel_data)
+                        if materials is not None:
+                            dve_data = self.export_to_divine_voxel_format(self.voxel_data, materials)
                             if self.save_voxel_data(dve_data):
                                 print("💾 Voxel data exported for Divine Voxel Engine")
-                
-                time.sleep(0.033)  # ~30 FPS
         
         finally:
             cv2.destroyAllWindows()
+            if self.kinect_stream is not None:
+                self.kinect_stream.stop()
+                self.kinect_stream = None
     
     def run_voxel_integration(self):
         """Run voxel system integration"""
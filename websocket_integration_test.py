@@ -11,146 +11,251 @@ import time
 import logging
 from typing import Dict, List
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Test requests, encoded once per wire format
+REQUESTS = {
+    "get_vehicles": {"command": "get_vehicles"},
+    "get_depth_data": {"command": "get_depth_data"},
+    "control_vehicle": {
+        "command": "control_vehicle",
+        "vehicle_id": "EX001",
+        "action": "move_forward"
+    }
+}
+
 class WebSocketTester:
     def __init__(self):
         self.telemetry_url = "ws://localhost:8766"
         self.depth_url = "ws://localhost:8765"
         self.test_results = []
+        self._result_queue = None  # Created inside run_all_tests' event loop
+        self._urls = {"telemetry": self.telemetry_url, "depth": self.depth_url}
+        self._sockets = {}  # Endpoint -> open connection, or the exception that prevented opening it
+        self._socket_locks = {}
+        self._stale_sockets = []  # Dropped after an unfinished exchange, closed at the end of the run
+        
+        # Per-test time budgets (s), enforced centrally in run_all_tests; the
+        # depth budget leaves room for its expected no-reply timeout
+        self.test_timeouts = {
+            "telemetry_connection": 3.0,
+            "depth_connection": 6.0,
+            "vehicle_control": 3.0,
+            "connection_stability": 8.0
+        }
+        # Exchanges give up this long before their test's budget runs out,
+        # so they time out themselves instead of being cancelled mid-reply
+        self.exchange_margin = 0.5
+        
+        # msgpack is used only on connections where the server picks the
+        # "msgpack" subprotocol; everything else stays JSON text frames
+        self._payloads = {None: {name: json.dumps(request) for name, request in REQUESTS.items()}}
+        if MSGPACK_AVAILABLE:
+            self._payloads["msgpack"] = {name: msgpack.packb(request, use_bin_type=True)
+                                         for name, request in REQUESTS.items()}
+    
+    async def _open(self, url, name):
+        """Open one shared connection; returns the exception instead if it fails"""
+        try:
+            subprotocols = ["msgpack"] if MSGPACK_AVAILABLE else None
+            websocket = await websockets.connect(url, subprotocols=subprotocols)
+            logger.info(f"✅ Connected to {name} server ({websocket.subprotocol or 'json'})")
+            return websocket
+        except Exception as e:
+            logger.error(f"❌ {name.capitalize()} connection failed: {e}")
+            return e
+    
+    def _deadline(self, test_name):
+        """Event loop time by which the exchanges of test_name must be done"""
+        return asyncio.get_running_loop().time() + self.test_timeouts[test_name] - self.exchange_margin
+    
+    async def _exchange(self, endpoint, request_name, deadline, decode=True):
+        """Send one pre-encoded request and return its decoded reply, one exchange at a time per endpoint"""
+        lock = self._socket_locks.setdefault(endpoint, asyncio.Lock())
+        async with lock:
+            websocket = self._sockets.get(endpoint)
+            if websocket is None:
+                # The previous connection was dropped, its late reply must not reach this exchange
+                websocket = await self._open(self._urls[endpoint], endpoint)
+                self._sockets[endpoint] = websocket
+            if isinstance(websocket, Exception):
+                raise websocket
+            
+            codec = websocket.subprotocol if websocket.subprotocol in self._payloads else None
+            try:
+                await websocket.send(self._payloads[codec][request_name])
+                timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+                response = await asyncio.wait_for(websocket.recv(), timeout=timeout)
+            except BaseException:
+                # Timed out or cancelled: a reply may still be queued, so stop sharing this socket
+                self._sockets[endpoint] = None
+                self._stale_sockets.append(websocket)
+                raise
         
-    async def test_telemetry_connection(self):
+        if not decode:
+            return response
+        if codec == "msgpack":
+            return msgpack.unpackb(response, raw=False)
+        return json.loads(response)
+    
+    def _record(self, result):
+        """Queue one test result; run_all_tests collects them in test order"""
+        self._result_queue.put_nowait(result)
+    
+    async def _timed(self, test_name, coro):
+        """Run one test under its time budget and log how long it took"""
+        start = time.perf_counter()
+        timeout = self.test_timeouts[test_name]
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"❌ {test_name} exceeded its {timeout:.0f}s budget")
+            self._record({"test": test_name, "status": "FAIL", "error": f"timeout after {timeout}s"})
+            return False
+        finally:
+            logger.info(f"⏱️ {test_name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    async def _run_on(self, endpoint, test_fn, test_name):
+        """Run test_fn on a shared connection, or record a FAIL if it never opened"""
+        websocket = self._sockets[endpoint]
+        if isinstance(websocket, Exception):
+            self._record({"test": test_name, "status": "FAIL", "error": str(websocket)})
+            return False
+        return await test_fn(endpoint)
+        
+    async def test_telemetry_connection(self, endpoint):
         """Test telemetry server WebSocket connection"""
         logger.info("🔗 Testing telemetry server connection...")
         
         try:
-            async with websockets.connect(self.telemetry_url) as websocket:
-                logger.info("✅ Connected to telemetry server")
-                
-                # Test vehicle list request
-                request = {"command": "get_vehicles"}
-                await websocket.send(json.dumps(request))
-                
-                response = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                data = json.loads(response)
-                
-                if data.get('type') == 'vehicle_list' and 'vehicles' in data:
-                    logger.info(f"✅ Vehicle list received: {len(data['vehicles'])} vehicles")
-                    self.test_results.append({"test": "telemetry_connection", "status": "PASS"})
-                    return True
-                else:
-                    logger.error(f"❌ Invalid response: {data}")
-                    self.test_results.append({"test": "telemetry_connection", "status": "FAIL"})
-                    return False
+            # Test vehicle list request
+            data = await self._exchange(endpoint, "get_vehicles", self._deadline("telemetry_connection"))
+            
+            if data.get('type') == 'vehicle_list' and 'vehicles' in data:
+                logger.info(f"✅ Vehicle list received: {len(data['vehicles'])} vehicles")
+                self._record({"test": "telemetry_connection", "status": "PASS"})
+                return True
+            else:
+                logger.error(f"❌ Invalid response: {data}")
+                self._record({"test": "telemetry_connection", "status": "FAIL"})
+                return False
                     
         except Exception as e:
             logger.error(f"❌ Telemetry connection failed: {e}")
-            self.test_results.append({"test": "telemetry_connection", "status": "FAIL", "error": str(e)})
+            self._record({"test": "telemetry_connection", "status": "FAIL", "error": str(e)})
             return False
     
-    async def test_depth_connection(self):
+    async def test_depth_connection(self, endpoint):
         """Test depth server WebSocket connection"""
         logger.info("🔗 Testing depth server connection...")
         
         try:
-            async with websockets.connect(self.depth_url) as websocket:
-                logger.info("✅ Connected to depth server")
-                
-                # Test depth data request
-                request = {"command": "get_depth_data"}
-                await websocket.send(json.dumps(request))
-                
-                # Wait for response or timeout
-                try:
-                    response = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                    logger.info("✅ Depth server responded")
-                    self.test_results.append({"test": "depth_connection", "status": "PASS"})
-                    return True
-                except asyncio.TimeoutError:
-                    logger.info("⚠️ Depth server timeout (normal for webcam issues)")
-                    self.test_results.append({"test": "depth_connection", "status": "PASS", "note": "timeout_expected"})
-                    return True
+            # Test depth data request, wait for response or timeout
+            try:
+                await self._exchange(endpoint, "get_depth_data", self._deadline("depth_connection"), decode=False)
+                logger.info("✅ Depth server responded")
+                self._record({"test": "depth_connection", "status": "PASS"})
+                return True
+            except asyncio.TimeoutError:
+                logger.info("⚠️ Depth server timeout (normal for webcam issues)")
+                self._record({"test": "depth_connection", "status": "PASS", "note": "timeout_expected"})
+                return True
                     
         except Exception as e:
             logger.error(f"❌ Depth connection failed: {e}")
-            self.test_results.append({"test": "depth_connection", "status": "FAIL", "error": str(e)})
+            self._record({"test": "depth_connection", "status": "FAIL", "error": str(e)})
             return False
     
-    async def test_vehicle_control(self):
+    async def test_vehicle_control(self, endpoint):
         """Test vehicle control commands"""
         logger.info("🚛 Testing vehicle control...")
         
         try:
-            async with websockets.connect(self.telemetry_url) as websocket:
-                # Test vehicle control command
-                request = {
-                    "command": "control_vehicle",
-                    "vehicle_id": "EX001",
-                    "action": "move_forward"
-                }
-                await websocket.send(json.dumps(request))
-                
-                response = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                data = json.loads(response)
-                
-                if data.get('type') == 'command_ack':
-                    logger.info("✅ Vehicle control command acknowledged")
-                    self.test_results.append({"test": "vehicle_control", "status": "PASS"})
-                    return True
-                else:
-                    logger.error(f"❌ Invalid control response: {data}")
-                    self.test_results.append({"test": "vehicle_control", "status": "FAIL"})
-                    return False
+            # Test vehicle control command
+            data = await self._exchange(endpoint, "control_vehicle", self._deadline("vehicle_control"))
+            
+            if data.get('type') == 'command_ack':
+                logger.info("✅ Vehicle control command acknowledged")
+                self._record({"test": "vehicle_control", "status": "PASS"})
+                return True
+            else:
+                logger.error(f"❌ Invalid control response: {data}")
+                self._record({"test": "vehicle_control", "status": "FAIL"})
+                return False
                     
         except Exception as e:
             logger.error(f"❌ Vehicle control failed: {e}")
-            self.test_results.append({"test": "vehicle_control", "status": "FAIL", "error": str(e)})
+            self._record({"test": "vehicle_control", "status": "FAIL", "error": str(e)})
             return False
     
-    async def test_connection_stability(self):
+    async def test_connection_stability(self, endpoint):
         """Test connection stability over time"""
         logger.info("⏱️ Testing connection stability...")
         
         try:
-            async with websockets.connect(self.telemetry_url) as websocket:
-                # Send multiple requests over time
-                for i in range(5):
-                    request = {"command": "get_vehicles"}
-                    await websocket.send(json.dumps(request))
-                    
-                    response = await asyncio.wait_for(websocket.recv(), timeout=2.0)
-                    data = json.loads(response)
-                    
-                    if data.get('type') != 'vehicle_list':
-                        logger.error(f"❌ Stability test failed at iteration {i}")
-                        self.test_results.append({"test": "connection_stability", "status": "FAIL"})
-                        return False
-                    
-                    await asyncio.sleep(0.5)  # Small delay between requests
+            # Send multiple requests over time, all within the test's budget
+            deadline = self._deadline("connection_stability")
+            for i in range(5):
+                data = await self._exchange(endpoint, "get_vehicles", deadline)
                 
-                logger.info("✅ Connection stability test passed")
-                self.test_results.append({"test": "connection_stability", "status": "PASS"})
-                return True
+                if data.get('type') != 'vehicle_list':
+                    logger.error(f"❌ Stability test failed at iteration {i}")
+                    self._record({"test": "connection_stability", "status": "FAIL"})
+                    return False
+                
+                await asyncio.sleep(0.5)  # Small delay between requests
+            
+            logger.info("✅ Connection stability test passed")
+            self._record({"test": "connection_stability", "status": "PASS"})
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Stability test failed: {e}")
-            self.test_results.append({"test": "connection_stability", "status": "FAIL", "error": str(e)})
+            self._record({"test": "connection_stability", "status": "FAIL", "error": str(e)})
             return False
     
     async def run_all_tests(self):
         """Run all WebSocket integration tests"""
         logger.info("🧪 Starting WebSocket Integration Tests...")
         
+        # One connection per endpoint, shared by every test that targets it
+        sockets = await asyncio.gather(*(self._open(url, endpoint) for endpoint, url in self._urls.items()))
+        self._sockets = dict(zip(self._urls, sockets))
+        
+        self._result_queue = asyncio.Queue()
         tests = [
-            self.test_telemetry_connection(),
-            self.test_depth_connection(),
-            self.test_vehicle_control(),
-            self.test_connection_stability()
+            ("telemetry_connection", "telemetry", self.test_telemetry_connection),
+            ("depth_connection", "depth", self.test_depth_connection),
+            ("vehicle_control", "telemetry", self.test_vehicle_control),
+            ("connection_stability", "telemetry", self.test_connection_stability)
         ]
         
-        results = await asyncio.gather(*tests, return_exceptions=True)
+        try:
+            if hasattr(asyncio, "TaskGroup"):  # Python 3.11+
+                async with asyncio.TaskGroup() as group:
+                    for name, endpoint, test_fn in tests:
+                        group.create_task(self._timed(name, self._run_on(endpoint, test_fn, name)))
+            else:
+                await asyncio.gather(*(self._timed(name, self._run_on(endpoint, test_fn, name))
+                                       for name, endpoint, test_fn in tests))
+        finally:
+            for websocket in [*self._sockets.values(), *self._stale_sockets]:
+                if websocket is not None and not isinstance(websocket, Exception):
+                    await websocket.close()
+        
+        # Collect results in test order, whatever order they finished in
+        order = {name: i for i, (name, _, _) in enumerate(tests)}
+        while not self._result_queue.empty():
+            self.test_results.append(self._result_queue.get_nowait())
+        self.test_results.sort(key=lambda result: order.get(result["test"], len(order)))
         
         # Calculate success rate
         passed = sum(1 for result in self.test_results if result.get('status') == 'PASS')
@@ -1,4 +1,5 @@
 import os
+import copy
 import panel as pn
 import time
 import numpy
@@ -8,6 +9,7 @@ from matplotlib.figure import Figure
 from .template import ModuleTemplate
 from .load_save_topography import LoadSaveTopoModule
 from sandbox import _test_data
+from sandbox.utils.fast_npz import open_npz
 from sandbox import set_logger
 logger = set_logger(__name__)
 
@@ -61,6 +63,30 @@ class LandslideSimulation(ModuleTemplate):
         logger.info("LandslideSimulation loaded successfully")
         #self.widget_all = self.show_widgets()
 
+    def __copy__(self):
+        """New module sharing the loaded topography arrays, simulation and release areas, with its own
+        LoadSaveTopoModule and the selection and playback state reset"""
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        # the topography module is updated with every frame, so each copy gets its own without drawn artists
+        new.Load_Area = copy.copy(self.Load_Area)
+        new.Load_Area.box_origin = list(self.Load_Area.box_origin)
+        new.Load_Area.frame = None
+        new.Load_Area._lod = None
+        new.Load_Area.__dict__.pop('_cont', None)
+        new.Load_Area.__dict__.pop('_label', None)
+        new.release_area = None
+        new.box_release_area = False
+        new._patch = None
+        new._lan = None
+        new._start = None
+        new._end = None
+        new.flow_selector = None
+        new.frame_selector = 0
+        new.simulation_frame = 0
+        new.running_simulation = False
+        return new
+
     def update(self, sb_params: dict):
         frame = sb_params.get('frame')
         ax = sb_params.get('ax')
@@ -113,38 +139,9 @@ class LandslideSimulation(ModuleTemplate):
                 self.simulation_frame = 0
 
         if self.flow_selector == 'Height':
-            if self.height_flow is None:
-                return
-            if self.running_simulation:
-                move = self.height_flow[..., self.simulation_frame]
-            else:
-                move = self.height_flow[..., self.frame_selector]
-            move = numpy.round(move, decimals=1)
-            move = numpy.ma.masked_where(move <= 0, move)
-            if self._lan is None:
-                self._lan = ax.imshow(move, cmap='hot', aspect='auto', origin='lower',
-                                      extent=self.Load_Area.to_box_extent, zorder=10)
-            else:
-                self._lan.set_data(move)
-
-            #move = self.Load_Area.modify_to_box_coordinates(move)
-            #self._lan = ax.pcolormesh(move, cmap='hot', shading='gouraud')
-
+            flow = self.height_flow
         elif self.flow_selector == 'Velocity':
-            if self.velocity_flow is None:
-                return
-            if self.running_simulation:
-                move = self.velocity_flow[..., self.simulation_frame]
-            else:
-                move = self.velocity_flow[..., self.frame_selector]
-            move = numpy.round(move, decimals=1)
-            move = numpy.ma.masked_where(move <= 0, move)
-            if self._lan is None:
-                self._lan = ax.imshow(move, cmap='hot', aspect='auto', origin='lower',
-                                      extent=self.Load_Area.to_box_extent, zorder=10)
-            else:
-                self._lan.set_data(move)
-
+            flow = self.velocity_flow
         else:
             if self._lan is not None:
                 self._lan.remove()
@@ -153,6 +150,20 @@ class LandslideSimulation(ModuleTemplate):
             #move[move == 0] = numpy.nan
             #move = self.Load_Area.modify_to_box_coordinates(move)
             #self._lan = ax.pcolormesh(move, cmap='hot', shading='gouraud')
+            return
+
+        if flow is None:
+            return
+        # take the frame out of the flow once, a memory-mapped flow is only read here
+        move = numpy.ascontiguousarray(flow[..., self.simulation_frame if self.running_simulation
+                                            else self.frame_selector])
+        move = numpy.round(move, decimals=1)
+        move = numpy.ma.masked_where(move <= 0, move)
+        if self._lan is None:
+            self._lan = ax.imshow(move, cmap='hot', aspect='auto', origin='lower',
+                                  extent=self.Load_Area.to_box_extent, zorder=10)
+        else:
+            self._lan.set_data(move)
 
     def plot_frame_panel(self):
         """Update the current frame to be displayed in the panel server"""
@@ -181,9 +192,10 @@ class LandslideSimulation(ModuleTemplate):
             cb1.remove()
             cb2.remove()
 
-    def load_simulation_data_npz(self, infile):
-        """Load landslide simulation from a .npz file """
-        files = numpy.load(infile)
+    def load_simulation_data_npz(self, infile, mmap_mode='r'):
+        """Load landslide simulation from a .npz file.
+        Uncompressed files are memory-mapped instead of copied into memory when loaded"""
+        files = open_npz(infile, mmap_mode=mmap_mode)
         self.velocity_flow = files['arr_0']
         self.height_flow = files['arr_1']
         self.counter = self.height_flow.shape[2] - 1
@@ -194,15 +206,17 @@ class LandslideSimulation(ModuleTemplate):
         self.release_options = []
         self.release_id_all = []
         self.release_area_all = []
-        list_files = os.listdir(data_path)
-        for i in list_files:
+        with os.scandir(data_path) as entries:
+            list_files = sorted((entry for entry in entries if entry.name.endswith('.npy')), key=lambda e: e.name)
+        for entry in list_files:
+            i = entry.name
             temp = [str(s) for s in i if s.isdigit()]
             if len(temp) > 0:
                 try:
                     if temp[-2] == self.Load_Area.file_id:
                         self.release_options.append(i)
                         self.release_id_all.append(temp[-1])
-                        self.release_area_all.append(numpy.load(data_path+i))
+                        self.release_area_all.append(numpy.load(entry.path, mmap_mode='r'))
                 except:
                     logger.warning("file %s is not compatible with the loading format" % i, exc_info=True)
 
@@ -222,10 +236,16 @@ class LandslideSimulation(ModuleTemplate):
         file_location = simulation_path + file_name
         self.load_simulation_data_npz(file_location)
 
+    @staticmethod
+    def _rect_from_points(pts):
+        """Corners [[xmin, ymin], [xmin, ymax], [xmax, ymax], [xmax, ymin]] of the box around the points"""
+        (xmin, ymin), (xmax, ymax) = numpy.amin(pts, axis=0), numpy.amax(pts, axis=0)
+        return numpy.asarray([[xmin, ymin], [xmin, ymax], [xmax, ymax], [xmax, ymin]])
+
     def modify_to_box_coordinates(self, id):
         """Move the origin of the release areas to be correctly displayed in the sandbox"""
         temp = self.release_area_all[int(id) - 1]
-        self.release_area = numpy.vstack((temp[:,0]+self.Load_Area.box_origin[0], temp[:,1]+self.Load_Area.box_origin[1])).T
+        self.release_area = self._rect_from_points(temp[:, :2]) + numpy.asarray(self.Load_Area.box_origin[:2])
 
     # Widgets
     def show_widgets(self):
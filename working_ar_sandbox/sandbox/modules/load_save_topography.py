@@ -8,6 +8,7 @@ import skimage.transform
 
 from .template import ModuleTemplate
 from sandbox import _test_data
+from sandbox.utils.fast_npz import open_npz
 from matplotlib.figure import Figure
 from sandbox import set_logger
 logger = set_logger(__name__)
@@ -264,12 +265,13 @@ class LoadSaveTopoModule(ModuleTemplate):
         """Load the absolute topography and relative topography from a .npz file.
         If usinng a single .npy is assumed to be an outside DEM """
         self.is_loaded = True
-        files = numpy.load(filename, allow_pickle=True)
         if filename.split(".")[-1] == "npz":
+            files = open_npz(filename)
             self.absolute_topo = files['arr_0']
             self.relative_topo = files['arr_1']
             logger.info('Load sandbox topography successfully')
         elif filename.split(".")[-1] == "npy":
+            files = numpy.load(filename, allow_pickle=True)
             target = [0, self.box_width, 0, self.box_height, self.extent[-2], self.extent[-1]]
             self.absolute_topo, self.relative_topo = self.normalize_topography(files, target)
 
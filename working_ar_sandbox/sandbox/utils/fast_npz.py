@@ -0,0 +1,108 @@
+import os
+import struct
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy
+from sandbox import set_logger
+logger = set_logger(__name__)
+
+# Fixed part of a zip local file header, the file name and extra field follow it
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_LOCAL_HEADER_SIGNATURE = 0x04034b50
+# Below this many bytes to read, starting worker threads costs more than loading the members in sequence
+_PARALLEL_MIN_SIZE = 1 << 20
+
+
+def _member_offset(fp, info):
+    """
+    Offset of the first byte of the member data, right after its local file header.
+    The data is read without zipfile, so its CRC is never checked: the header is validated instead
+    to make sure the offset points at the member.
+    """
+    fp.seek(info.header_offset)
+    header = fp.read(_LOCAL_HEADER.size)
+    if len(header) != _LOCAL_HEADER.size:
+        raise zipfile.BadZipFile("Truncated local header for %s" % info.filename)
+    signature, _, _, compress_type, _, _, _, _, _, name_length, extra_length = _LOCAL_HEADER.unpack(header)
+    if signature != _LOCAL_HEADER_SIGNATURE or compress_type != info.compress_type:
+        raise zipfile.BadZipFile("Bad local header for %s" % info.filename)
+    return info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+
+def _memmap_member(path, fp, mmap_mode):
+    """Map the data of the .npy member at the current position of fp, None if it can't be mapped"""
+    version = numpy.lib.format.read_magic(fp)
+    if version == (1, 0):
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(fp)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(fp)
+    else:
+        return None
+    if dtype.hasobject:
+        return None
+    return numpy.memmap(path, dtype=dtype, shape=shape, order='F' if fortran_order else 'C',
+                        mode=mmap_mode, offset=fp.tell())
+
+
+def _read_member(zf, fp, info, mmap_mode=None):
+    """Read one .npy member, directly from the file if it is stored without compression"""
+    if info.compress_type != zipfile.ZIP_STORED:
+        logger.debug("%s is compressed, reading it through zipfile" % info.filename)
+        with zf.open(info) as member:
+            return numpy.lib.format.read_array(member)
+    offset = _member_offset(fp, info)
+    if mmap_mode is not None:
+        fp.seek(offset)
+        array = _memmap_member(fp.name, fp, mmap_mode)
+        if array is not None:
+            return array
+    fp.seek(offset)
+    return numpy.lib.format.read_array(fp)
+
+
+def load_npz(path, mmap_mode=None):
+    """
+    Load all the arrays from a .npz file. Large files are loaded with one thread per member,
+    zlib and file reads release the GIL so the members are inflated and read concurrently.
+    Args:
+        path: location of the .npz file
+        mmap_mode: if given (e.g. 'r'), uncompressed members are memory-mapped instead of read
+    Returns:
+        dict with the name of each array and the array
+    """
+    with zipfile.ZipFile(path) as zf:
+        members = [info for info in zf.infolist() if info.filename.endswith('.npy')]
+        to_read = sum(info.file_size for info in members
+                      if mmap_mode is None or info.compress_type != zipfile.ZIP_STORED)
+        if len(members) < 2 or to_read < _PARALLEL_MIN_SIZE:
+            with open(path, 'rb') as fp:
+                return {info.filename[:-4]: _read_member(zf, fp, info, mmap_mode) for info in members}
+
+        def load(info):
+            # every worker gets its own ZipFile and file handle, nothing is shared between threads
+            with zipfile.ZipFile(path) as worker_zf, open(path, 'rb') as fp:
+                return _read_member(worker_zf, fp, info, mmap_mode)
+
+        with ThreadPoolExecutor(max_workers=min(len(members), os.cpu_count() or 1)) as executor:
+            return {info.filename[:-4]: array for info, array in zip(members, executor.map(load, members))}
+
+
+@lru_cache(maxsize=8)
+def _load_npz_cached(path, mmap_mode, mtime_ns, size):
+    return load_npz(path, mmap_mode=mmap_mode)
+
+
+def open_npz(path, mmap_mode=None):
+    """
+    Same as load_npz, but files that were already loaded are served from memory.
+    The cache is keyed on the modification time and size of the file, so a file saved again is read again.
+    The returned arrays are shared between callers and must not be modified in place.
+    Args:
+        path: location of the .npz file
+        mmap_mode: if given (e.g. 'r'), uncompressed members are memory-mapped instead of read
+    Returns:
+        dict with the name of each array and the array
+    """
+    stat = os.stat(path)
+    return dict(_load_npz_cached(path, mmap_mode, stat.st_mtime_ns, stat.st_size))
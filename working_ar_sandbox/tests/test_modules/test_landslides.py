@@ -1,111 +1,229 @@
+import os
+import matplotlib
+# SANDBOX_TESTS_INTERACTIVE=1 opens the figures and panels, otherwise they are only rendered off-screen
+_interactive = os.environ.get('SANDBOX_TESTS_INTERACTIVE') == '1'
+if not _interactive:
+    matplotlib.use('Agg', force=True)
 from sandbox import _test_data as test_data
 from sandbox.modules import LandslideSimulation
 import matplotlib.pyplot as plt
 import pytest
 import numpy as np
-file = np.load(test_data['topo'] + "DEM1.npz")
-frame = file['arr_0']
-extent = [0, frame.shape[1], 0, frame.shape[0], frame.min(), frame.max()]
-
+import copy
+import types
+from collections import ChainMap
+from functools import lru_cache
+
+
+def _sidecar(source, cache_dir, suffix, write):
+    """
+    Path of a converted copy of source in cache_dir, (re)built with write(path) when it is missing
+    or older than source. Written under a temporary name first so parallel workers never read a half
+    written file.
+    """
+    target = os.path.join(cache_dir, os.path.splitext(os.path.basename(source))[0] + suffix)
+    if not os.path.isfile(target) or os.path.getmtime(target) < os.path.getmtime(source):
+        tmp_path = target + ".%d.tmp" % os.getpid()
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return target
+
+def _load_frame(cache_dir):
+    # the plain .npy can be memory-mapped instead of inflated on every run
+    source = test_data['topo'] + "DEM1.npz"
+
+    def write(path):
+        with open(path, 'wb') as f:
+            np.save(f, np.load(source)['arr_0'])
+
+    return np.load(_sidecar(source, cache_dir, ".npy", write), mmap_mode='r')
+
+def _ensure_feather(arucos, cache_dir):
+    """Feather copy of the pickled markers. Returns None if feather can't be written"""
+    import pandas as pd
+    try:
+        # feather needs pyarrow and a default index, otherwise keep reading the pickle
+        return _sidecar(arucos, cache_dir, ".feather", lambda path: pd.read_pickle(arucos).to_feather(path))
+    except Exception:
+        return None
 
-def load_marker():
+@lru_cache(maxsize=1)
+def load_marker(cache_dir):
     import pandas as pd
     from sandbox import _test_data
     arucos = _test_data['test'] + "arucos.pkl"
     try:
-        df = pd.read_pickle(arucos)
+        feather = _ensure_feather(arucos, cache_dir)
+        df = pd.read_feather(feather) if feather is not None else pd.read_pickle(arucos)
         print("Arucos loaded")
     except:
         df = pd.DataFrame()
         print("No arucos found")
     return df
 
-fig, ax = plt.subplots()
-pytest.sb_params = {'frame': frame,
-                    'ax': ax,
-                    'fig': fig,
-                    'extent': extent,
-                    'marker': load_marker(),
-                    'cmap': plt.cm.get_cmap('gist_earth_r'),
-                    'norm': None,
-                    'active_cmap': True,
-                    'active_contours': True}
-
-def update(module):
-    pytest.sb_params['ax'].cla()
-    sb_params = module.update(pytest.sb_params)
+# every plotting test draws on this one figure, so the backend canvas is only created once per worker
+_figure_num = 'sandbox-tests'
+
+def _new_fig_ax():
+    """Clear the shared figure and return it with a fresh axes"""
+    fig = plt.figure(_figure_num, clear=True)
+    return fig, fig.add_subplot(111)
+
+def _display_frame(frame, res=512):
+    """Stride the frame down to at most res pixels per side, more is not visible at the test dpi"""
+    s = max(1, -(-max(frame.shape) // res))
+    return frame[::s, ::s]
+
+def _pixel_extent(frame):
+    """Pixel extent of the full resolution frame, so a strided frame lands on the same data coordinates"""
+    return (-0.5, frame.shape[1] - 0.5, -0.5, frame.shape[0] - 0.5)
+
+def _show_frame(ax, frame, extent, rgba=None):
+    """Draw the DEM on ax, from the pre-coloured rgba image if given, otherwise with data values and vmin/vmax"""
+    if rgba is not None:
+        return ax.imshow(rgba, origin='lower', interpolation='nearest', extent=_pixel_extent(frame))
+    return ax.imshow(_display_frame(frame), vmin=extent[-2], vmax=extent[-1], cmap='gist_earth_r',
+                     origin='lower', extent=_pixel_extent(frame))
+
+def _show(obj):
+    """Show a figure or panel object in interactive runs, otherwise just render it"""
+    if _interactive:
+        obj.show()
+    elif hasattr(obj, 'canvas'):
+        obj.canvas.draw_idle()
+    else:
+        obj.get_root()
+
+def update(module, sb_params, frame_rgba):
+    sb_params = module.update(sb_params)
     ax = sb_params['ax']
     fig = sb_params['fig']
-    ax.imshow(sb_params.get('frame'), vmin=sb_params.get('extent')[-2], vmax=sb_params.get('extent')[-1],
-              cmap=sb_params.get('cmap'), norm=sb_params.get('norm'), origin='lower')
-    fig.show()
+    _show_frame(ax, sb_params['frame'], sb_params['extent'], frame_rgba)
+    _show(fig)
+
+
+@pytest.fixture(scope="session")
+def cache_dir(request, tmp_path_factory):
+    """Where converted copies of the test data live, the source data folders are never written to"""
+    cache = getattr(request.config, 'cache', None)
+    if cache is None:
+        return str(tmp_path_factory.mktemp('landslides'))
+    return str(cache.mkdir('landslides'))
+
+@pytest.fixture(scope="session")
+def frame(cache_dir):
+    return _load_frame(cache_dir)
+
+@pytest.fixture(scope="session")
+def extent(frame):
+    return [0, frame.shape[1], 0, frame.shape[0], frame.min(), frame.max()]
+
+@pytest.fixture(scope="session")
+def frame_rgba(frame, extent):
+    """The DEM coloured once, imshow then skips the normalize and colormap steps on every draw"""
+    norm = plt.Normalize(extent[-2], extent[-1])
+    return plt.cm.get_cmap('gist_earth_r')(norm(np.asarray(_display_frame(frame))), bytes=True)
+
+@pytest.fixture(scope="session")
+def base_params(extent, cache_dir):
+    """Parameters shared by every render, read-only"""
+    return types.MappingProxyType({'extent': extent,
+                                   'marker': load_marker(cache_dir),
+                                   'cmap': plt.cm.get_cmap('gist_earth_r'),
+                                   'norm': None,
+                                   'active_cmap': True,
+                                   'active_contours': True})
+
+@pytest.fixture()
+def fig_ax():
+    return _new_fig_ax()
+
+@pytest.fixture()
+def sb_params(frame, fig_ax, base_params):
+    fig, ax = fig_ax
+    # writes of the module (e.g. 'active_contours') land in the overlay and never leak into the baseline
+    return ChainMap({'frame': frame, 'ax': ax, 'fig': fig}, base_params)
+
+@pytest.fixture(scope="module", autouse=True)
+def close_figure():
+    yield
+    plt.close(_figure_num)
+
+@pytest.fixture(scope="module")
+def simulation_module(extent):
+    module = LandslideSimulation(extent=extent)
+    module.load_simulation_data_npz(test_data['landslide_simulation'] + 'Sim_Topo1_Rel13_results4sandbox.npz')
+    return module
+
+@pytest.fixture(scope="module")
+def release_module(extent):
+    module = LandslideSimulation(extent=extent)
+    module.Load_Area.loadTopo(test_data['landslide_topo'] + 'Topography_3.npz')
+    module.load_release_area(test_data['landslide_release'])
+    return module
+
+@pytest.fixture()
+def module(simulation_module):
+    # shares the loaded simulation with the prototype, the selectors start from scratch
+    return copy.copy(simulation_module)
+
+@pytest.fixture()
+def release(release_module):
+    return copy.copy(release_module)
 
 
-def test_init():
+def test_init(extent):
     module = LandslideSimulation(extent=extent)
     print(module)
 
-def test_update():
-    module = LandslideSimulation(extent=extent)
-    update(module)
+def test_update(module, sb_params, frame_rgba):
+    update(module, sb_params, frame_rgba)
 
-def test_load_simulation():
-    module = LandslideSimulation(extent=extent)
-    module.load_simulation_data_npz(test_data['landslide_simulation']+'Sim_Topo1_Rel13_results4sandbox.npz')
+def test_load_simulation(module):
     assert module.velocity_flow is not None and module.height_flow is not None
 
-def test_load_release_area():
-    module = LandslideSimulation(extent=extent)
-    module.Load_Area.loadTopo(test_data['landslide_topo']+'Topography_3.npz')
+def test_load_release_area(release):
+    module = release
     assert module.Load_Area.file_id == '3'
 
-    module.load_release_area(test_data['landslide_release'])
     lst = ['ReleaseArea_3_1.npy', 'ReleaseArea_3_2.npy','ReleaseArea_3_2.npy']
     assert [i in lst for i in module.release_options]
     lst2 = ['1', '2', '3']
     assert [i in lst for i in module.release_id_all]
 
-def test_show_box_release():
-    module = LandslideSimulation(extent=extent)
-    module.Load_Area.loadTopo(test_data['landslide_topo'] + 'Topography_3.npz')
-    module.load_release_area(test_data['landslide_release'])
+def test_show_box_release(release, fig_ax, frame, extent, frame_rgba):
+    module = release
     module.modify_to_box_coordinates(id = '1')
-    fig, ax = plt.subplots()
-    ax.imshow(frame, vmin=extent[-2], vmax=extent[-1], cmap='gist_earth_r',origin='lower')
+    fig, ax = fig_ax
+    _show_frame(ax, frame, extent, frame_rgba)
     module.show_box_release(ax, module.release_area)
     #TODO assert np.allclose(np.asarray([[74., 72.], [74., 84.],[86., 84.],[86., 72.]]), module.release_area)
-    fig.show()
+    _show(fig)
 
-def test_plot_landslide():
-    module = LandslideSimulation(extent=extent)
-    module.load_simulation_data_npz(test_data['landslide_simulation'] + 'Sim_Topo1_Rel13_results4sandbox.npz')
+def test_plot_landslide(module, fig_ax, frame, extent, frame_rgba):
     module.flow_selector = "Velocity"
     module.frame_selector = 10
-    fig, ax = plt.subplots()
-    ax.imshow(frame, vmin=extent[-2], vmax=extent[-1], cmap='gist_earth_r', origin='lower')
+    fig, ax = fig_ax
+    _show_frame(ax, frame, extent, frame_rgba)
     module.plot_landslide_frame(ax)
-    fig.show()
+    _show(fig)
 
+    # keep the DEM image, the landslide image is updated in place with the height flow
     module.flow_selector = "Height"
-    ax.cla()
-    ax.imshow(frame, vmin=extent[-2], vmax=extent[-1], cmap='gist_earth_r', origin='lower')
     module.plot_landslide_frame(ax)
-    fig.show()
+    _show(fig)
 
-def test_panel_plot():
-    module = LandslideSimulation(extent=extent)
-    module.load_simulation_data_npz(test_data['landslide_simulation'] + 'Sim_Topo1_Rel13_results4sandbox.npz')
+def test_panel_plot(module):
     module.frame_selector = 10
     module.plot_frame_panel()
-    module.plot_flow_frame.show()
+    _show(module.plot_flow_frame)
 
-def test_show_widgets():
-    module = LandslideSimulation(extent=extent)
-    module.load_simulation_data_npz(test_data['landslide_simulation'] + 'Sim_Topo1_Rel13_results4sandbox.npz')
+def test_show_widgets(module):
     module.flow_selector = "Velocity"
     module.frame_selector = 10
     landslide = module.show_widgets()
-    landslide.show()
-
-
-
+    _show(landslide)